@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Batch - Render many GIFs from a manifest across a worker pool.
+
+Each job names a render function ("module:function") that draws frames into a
+GIFBuilder. Jobs run on the shared process pool from core.parallel, so
+interpreter and import startup is paid once per worker rather than per GIF.
+
+Usage:
+    python -m core.batch manifest.json [--workers N] [--output-dir DIR] [--stats stats.json]
+
+Manifest (JSON, or YAML with PyYAML installed):
+    {
+        "defaults": {"width": 128, "height": 128, "fps": 10,
+                     "save": {"num_colors": 48, "optimize_for_emoji": true}},
+        "palettes": {"brand": [[255, 255, 255], [74, 21, 75], [54, 197, 240]]},
+        "jobs": [
+            {"name": "wave", "render": "scenes:wave", "args": {"speed": 2},
+             "output": "wave.gif", "palette": "brand"}
+        ]
+    }
+
+A render function is called as func(builder, **args) and either adds frames
+to the builder or returns an iterable of frames.
+
+Jobs sharing a "palette" key reuse one palette: either the colors listed under
+"palettes", or one built from the combined color histograms of every job with
+that key. Those jobs are rendered once and parked on disk until every job
+with the key has rendered; then the palette is built from their histograms
+(merged in manifest order, so it doesn't depend on which job finishes first)
+and they are saved. Its size is the num_colors of the first such job.
+"""
+
+import argparse
+import importlib
+import json
+import pickle
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Optional
+
+from core.gif_builder import GIFBuilder
+from core.palette import ColorHistogram, palette_from_histogram
+from core.parallel import get_executor, resolve_workers
+
+
+def load_manifest(manifest_path: str | Path) -> dict:
+    """
+    Load a JSON or YAML manifest.
+
+    Args:
+        manifest_path: Path to .json, .yaml or .yml manifest
+
+    Returns:
+        Manifest dictionary
+    """
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text()
+
+    if manifest_path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError(
+                "PyYAML is required for YAML manifests. Install with: pip install pyyaml"
+            ) from e
+        manifest = yaml.safe_load(text)
+    else:
+        manifest = json.loads(text)
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise TypeError(
+            f"Manifest must be a mapping with a 'jobs' list: {manifest_path}"
+        )
+    return manifest
+
+
+def expand_jobs(
+    manifest: dict, base_dir: Path, output_dir: Optional[Path] = None
+) -> list[dict]:
+    """
+    Merge defaults into each job and resolve output paths.
+
+    Args:
+        manifest: Manifest dictionary
+        base_dir: Directory the manifest lives in (added to sys.path in workers)
+        output_dir: Override for manifest "output_dir"
+
+    Returns:
+        List of fully specified job dictionaries
+    """
+    defaults = manifest.get("defaults", {})
+    palettes = manifest.get("palettes", {})
+    if output_dir is None:
+        output_dir = base_dir / manifest.get("output_dir", ".")
+
+    jobs = []
+    for i, spec in enumerate(manifest["jobs"]):
+        if "render" not in spec:
+            raise ValueError(f"Job {i} has no 'render' function")
+
+        name = spec.get("name", f"job-{i}")
+        job = {**defaults, **spec, "name": name}
+        job["save"] = {**defaults.get("save", {}), **spec.get("save", {})}
+        job["output"] = str(output_dir / spec.get("output", f"{name}.gif"))
+        job["base_dir"] = str(base_dir)
+
+        palette_key = job.get("palette")
+        if palette_key is not None and palette_key in palettes:
+            job["palette_colors"] = palettes[palette_key]
+        jobs.append(job)
+
+    return jobs
+
+
+def shared_palette_keys(jobs: list[dict]) -> set[str]:
+    """Palette keys used by several jobs and not listed under "palettes"."""
+    counts = Counter(
+        job["palette"]
+        for job in jobs
+        if job.get("palette") is not None and "palette_colors" not in job
+    )
+    return {key for key, count in counts.items() if count > 1}
+
+
+def job_num_colors(job: dict) -> int:
+    """Palette size save() would use for a job."""
+    num_colors = job["save"].get("num_colors", 128)
+    if job["save"].get("optimize_for_emoji"):
+        num_colors = min(num_colors, 48)
+    return num_colors
+
+
+def _render(job: dict) -> GIFBuilder:
+    """Run a job's render function into a new GIFBuilder."""
+    if job["base_dir"] not in sys.path:
+        sys.path.insert(0, job["base_dir"])
+
+    module_name, _, func_name = job["render"].partition(":")
+    render = getattr(importlib.import_module(module_name), func_name)
+
+    builder = GIFBuilder(
+        width=job.get("width", 480),
+        height=job.get("height", 480),
+        fps=job.get("fps", 15),
+    )
+    frames = render(builder, **job.get("args", {}))
+    if frames is not None:
+        builder.add_frames(list(frames))
+    return builder
+
+
+def render_job(job: dict) -> dict:
+    """
+    Render and save a single job (runs inside a worker process).
+
+    A job with a "spill" path (one sharing a palette built from the batch)
+    stops after rendering: its builder is pickled to that path and its color
+    histogram returned as stats["histogram"]; save_job() finishes it.
+
+    Args:
+        job: Job dictionary from expand_jobs()
+
+    Returns:
+        Per-job stats (timings, size, frame count, or the error message)
+    """
+    stats = {"name": job["name"], "output": job["output"], "ok": False}
+    start = time.perf_counter()
+    try:
+        builder = _render(job)
+        stats["render_seconds"] = time.perf_counter() - start
+
+        if job.get("spill"):
+            if len(builder.histogram) == 0:
+                # Frames were assigned directly rather than through add_frame()
+                for frame in builder.frames:
+                    builder.histogram.add(frame)
+            with open(job["spill"], "wb") as f:
+                pickle.dump(builder, f, protocol=pickle.HIGHEST_PROTOCOL)
+            stats.update(ok=True, histogram=builder.histogram)
+        else:
+            _save(job, builder, stats)
+    except Exception as e:
+        # Render functions are user code: any failure fails this job only,
+        # and is reported in its stats
+        stats["error"] = f"{type(e).__name__}: {e}"
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def save_job(job: dict, stats: dict) -> dict:
+    """
+    Save a job parked by render_job() with its shared palette (runs inside a worker process).
+
+    Args:
+        job: Job dictionary with "spill" and "palette_colors"
+        stats: Stats returned by render_job() for this job
+
+    Returns:
+        Per-job stats (timings, size, frame count, or the error message)
+    """
+    stats = {**stats, "ok": False}
+    start = time.perf_counter()
+    try:
+        spill = Path(job["spill"])
+        with open(spill, "rb") as f:
+            builder = pickle.load(f)
+        spill.unlink()
+        _save(job, builder, stats)
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+    stats["seconds"] += time.perf_counter() - start
+    return stats
+
+
+def _save(job: dict, builder: GIFBuilder, stats: dict):
+    """Save a rendered builder to the job's output and record its stats."""
+    start = time.perf_counter()
+    Path(job["output"]).parent.mkdir(parents=True, exist_ok=True)
+    info = builder.save(
+        job["output"],
+        palette=job.get("palette_colors"),
+        verbose=False,
+        **job["save"],
+    )
+    stats.update(
+        ok=True,
+        save_seconds=time.perf_counter() - start,
+        size_bytes=int(info["size_kb"] * 1024),
+        frame_count=info["frame_count"],
+        dimensions=info["dimensions"],
+    )
+
+
+def run_batch(
+    manifest_path: str | Path,
+    workers: Optional[int] = None,
+    output_dir: Optional[str | Path] = None,
+    verbose: bool = True,
+) -> dict:
+    """
+    Render every job in a manifest across a process pool.
+
+    Args:
+        manifest_path: Path to the manifest
+        workers: Worker processes (None = one per CPU)
+        output_dir: Override for manifest "output_dir"
+        verbose: Print one line per finished job and a summary
+
+    Returns:
+        Dictionary with "jobs" (per-job stats, manifest order) and "summary"
+    """
+    manifest_path = Path(manifest_path).resolve()
+    manifest = load_manifest(manifest_path)
+    jobs = expand_jobs(
+        manifest,
+        manifest_path.parent,
+        Path(output_dir).resolve() if output_dir else None,
+    )
+    workers = resolve_workers(workers)
+
+    start = time.perf_counter()
+    executor = get_executor(workers)
+    results: list[Optional[dict]] = [None] * len(jobs)
+
+    def finished(index: int, stats: dict):
+        results[index] = stats
+        if not verbose:
+            return
+        if stats["ok"]:
+            print(
+                f"  ✓ {stats['name']}: {stats['size_bytes'] / 1024:.1f} KB,"
+                f" {stats['frame_count']} frames in {stats['seconds']:.2f}s"
+            )
+        else:
+            print(f"  ✗ {stats['name']}: {stats['error']}")
+
+    # Jobs sharing a built palette are parked after rendering until every job
+    # with their key has rendered, so the palette covers all of them
+    shared = shared_palette_keys(jobs)
+    spill_dir = tempfile.TemporaryDirectory(prefix="gif-batch-") if shared else None
+    unrendered = Counter()
+    for i, job in enumerate(jobs):
+        if job.get("palette") in shared:
+            job["spill"] = str(Path(spill_dir.name) / f"{i}.pickle")
+            unrendered[job["palette"]] += 1
+    parked: dict[int, dict] = {}
+
+    try:
+        futures = {executor.submit(render_job, job): i for i, job in enumerate(jobs)}
+        saving = set()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures.pop(future)
+                stats = future.result()
+                job = jobs[index]
+                if future in saving or "spill" not in job:
+                    saving.discard(future)
+                    finished(index, stats)
+                    continue
+
+                # A job sharing a built palette finished rendering
+                if stats["ok"]:
+                    parked[index] = stats
+                else:
+                    finished(index, stats)
+                key = job["palette"]
+                unrendered[key] -= 1
+                if unrendered[key] > 0:
+                    continue
+
+                # Every job with this key has rendered: merge in manifest order
+                # so the float sums (and palette) are reproducible
+                group = [i for i in sorted(parked) if jobs[i]["palette"] == key]
+                if not group:
+                    continue
+                histogram = ColorHistogram()
+                for i in group:
+                    histogram.merge(parked[i].pop("histogram"))
+                first = next(j for j in jobs if j.get("palette") == key)
+                colors = palette_from_histogram(
+                    histogram, job_num_colors(first)
+                ).tolist()
+                for i in group:
+                    jobs[i]["palette_colors"] = colors
+                    save_future = executor.submit(save_job, jobs[i], parked.pop(i))
+                    futures[save_future] = i
+                    saving.add(save_future)
+    finally:
+        if spill_dir is not None:
+            spill_dir.cleanup()
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r["ok"]]
+    summary = {
+        "jobs": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "workers": workers,
+        "wall_seconds": elapsed,
+        "total_bytes": sum(r["size_bytes"] for r in succeeded),
+        "gifs_per_second": len(succeeded) / elapsed if elapsed > 0 else 0.0,
+    }
+
+    if verbose:
+        print(f"\n✓ Rendered {summary['succeeded']}/{summary['jobs']} GIFs")
+        print(f"  Workers: {workers}")
+        print(f"  Time: {elapsed:.1f}s ({summary['gifs_per_second']:.1f} GIFs/s)")
+        print(f"  Total size: {summary['total_bytes'] / 1024:.1f} KB")
+
+    return {"jobs": results, "summary": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a batch of Slack GIFs from a manifest",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m core.batch emoji.json
+  python -m core.batch emoji.yaml --workers 32 --output-dir build/gifs --stats stats.json
+        """,
+    )
+
+    parser.add_argument("manifest", help="JSON or YAML manifest of jobs")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument("--output-dir", help="Override the manifest output_dir")
+    parser.add_argument("--stats", help="Write per-job stats and summary as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        report = run_batch(args.manifest, args.workers, args.output_dir)
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.stats:
+        Path(args.stats).write_text(json.dumps(report, indent=2))
+
+    return 0 if report["summary"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
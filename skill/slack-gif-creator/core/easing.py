@@ -7,6 +7,10 @@ All functions take a value t (0.0 to 1.0) and return eased value (0.0 to 1.0).
 """
 
 import math
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
 
 
 def linear(t: float) -> float:
@@ -115,8 +119,16 @@ EASING_FUNCTIONS = {
 
 
 def get_easing(name: str = "linear"):
-    """Get easing function by name."""
-    return EASING_FUNCTIONS.get(name, linear)
+    """
+    Get easing function by name.
+
+    Besides the names in EASING_FUNCTIONS, "cubic_bezier(x1, y1, x2, y2)"
+    gives a CSS-style curve (see cubic_bezier()).
+    """
+    func = EASING_FUNCTIONS.get(name)
+    if func is not None:
+        return func
+    return _parse_cubic_bezier(name) or linear
 
 
 def interpolate(start: float, end: float, t: float, easing: str = "linear") -> float:
@@ -132,8 +144,9 @@ def interpolate(start: float, end: float, t: float, easing: str = "linear") -> f
     Returns:
         Interpolated value
     """
-    ease_func = get_easing(easing)
-    eased_t = ease_func(t)
+    if isinstance(t, np.ndarray):
+        return interpolate_many(start, end, t, easing)
+    eased_t = get_easing(easing)(t)
     return start + (end - start) * eased_t
 
 
@@ -232,3 +245,397 @@ EASING_FUNCTIONS.update(
         "overshoot": ease_back_out,  # Alias
     }
 )
+
+
+# Array versions: same curves as the scalar functions, evaluated over a whole
+# NumPy array of t values at once
+
+
+def linear_array(t: np.ndarray) -> np.ndarray:
+    """Linear interpolation over an array of t."""
+    return np.asarray(t, dtype=np.float64)
+
+
+def ease_in_quad_array(t: np.ndarray) -> np.ndarray:
+    """Quadratic ease-in over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return t * t
+
+
+def ease_out_quad_array(t: np.ndarray) -> np.ndarray:
+    """Quadratic ease-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return t * (2 - t)
+
+
+def ease_in_out_quad_array(t: np.ndarray) -> np.ndarray:
+    """Quadratic ease-in-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return np.where(t < 0.5, 2 * t * t, -1 + (4 - 2 * t) * t)
+
+
+def ease_in_cubic_array(t: np.ndarray) -> np.ndarray:
+    """Cubic ease-in over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return t * t * t
+
+
+def ease_out_cubic_array(t: np.ndarray) -> np.ndarray:
+    """Cubic ease-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return (t - 1) * (t - 1) * (t - 1) + 1
+
+
+def ease_in_out_cubic_array(t: np.ndarray) -> np.ndarray:
+    """Cubic ease-in-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return np.where(t < 0.5, 4 * t * t * t, (t - 1) * (2 * t - 2) * (2 * t - 2) + 1)
+
+
+def ease_in_bounce_array(t: np.ndarray) -> np.ndarray:
+    """Bounce ease-in over an array of t."""
+    return 1 - ease_out_bounce_array(1 - np.asarray(t, dtype=np.float64))
+
+
+def ease_out_bounce_array(t: np.ndarray) -> np.ndarray:
+    """Bounce ease-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return np.piecewise(
+        t,
+        [
+            t < 1 / 2.75,
+            (t >= 1 / 2.75) & (t < 2 / 2.75),
+            (t >= 2 / 2.75) & (t < 2.5 / 2.75),
+        ],
+        [
+            lambda t: 7.5625 * t * t,
+            lambda t: 7.5625 * (t - 1.5 / 2.75) * (t - 1.5 / 2.75) + 0.75,
+            lambda t: 7.5625 * (t - 2.25 / 2.75) * (t - 2.25 / 2.75) + 0.9375,
+            lambda t: 7.5625 * (t - 2.625 / 2.75) * (t - 2.625 / 2.75) + 0.984375,
+        ],
+    )
+
+
+def ease_in_out_bounce_array(t: np.ndarray) -> np.ndarray:
+    """Bounce ease-in-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    return np.where(
+        t < 0.5,
+        ease_in_bounce_array(t * 2) * 0.5,
+        ease_out_bounce_array(t * 2 - 1) * 0.5 + 0.5,
+    )
+
+
+def ease_in_elastic_array(t: np.ndarray) -> np.ndarray:
+    """Elastic ease-in over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    eased = -np.power(2.0, 10 * (t - 1)) * np.sin((t - 1.1) * 5 * math.pi)
+    return np.where((t == 0) | (t == 1), t, eased)
+
+
+def ease_out_elastic_array(t: np.ndarray) -> np.ndarray:
+    """Elastic ease-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    eased = np.power(2.0, -10 * t) * np.sin((t - 0.1) * 5 * math.pi) + 1
+    return np.where((t == 0) | (t == 1), t, eased)
+
+
+def ease_in_out_elastic_array(t: np.ndarray) -> np.ndarray:
+    """Elastic ease-in-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    u = t * 2 - 1
+    wave = np.sin((u - 0.1) * 5 * math.pi)
+    eased = np.where(
+        u < 0,
+        -0.5 * np.power(2.0, 10 * u) * wave,
+        np.power(2.0, -10 * u) * wave * 0.5 + 1,
+    )
+    return np.where((t == 0) | (t == 1), t, eased)
+
+
+def ease_back_in_array(t: np.ndarray) -> np.ndarray:
+    """Back ease-in over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    c1 = 1.70158
+    c3 = c1 + 1
+    return c3 * t * t * t - c1 * t * t
+
+
+def ease_back_out_array(t: np.ndarray) -> np.ndarray:
+    """Back ease-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    c1 = 1.70158
+    c3 = c1 + 1
+    return 1 + c3 * (t - 1) ** 3 + c1 * (t - 1) ** 2
+
+
+def ease_back_in_out_array(t: np.ndarray) -> np.ndarray:
+    """Back ease-in-out over an array of t."""
+    t = np.asarray(t, dtype=np.float64)
+    c1 = 1.70158
+    c2 = c1 * 1.525
+    return np.where(
+        t < 0.5,
+        ((2 * t) ** 2 * ((c2 + 1) * 2 * t - c2)) / 2,
+        ((2 * t - 2) ** 2 * ((c2 + 1) * (t * 2 - 2) + c2) + 2) / 2,
+    )
+
+
+# Array counterparts of EASING_FUNCTIONS, under the same names
+EASING_ARRAY_FUNCTIONS = {
+    "linear": linear_array,
+    "ease_in": ease_in_quad_array,
+    "ease_out": ease_out_quad_array,
+    "ease_in_out": ease_in_out_quad_array,
+    "bounce_in": ease_in_bounce_array,
+    "bounce_out": ease_out_bounce_array,
+    "bounce": ease_in_out_bounce_array,
+    "elastic_in": ease_in_elastic_array,
+    "elastic_out": ease_out_elastic_array,
+    "elastic": ease_in_out_elastic_array,
+    "back_in": ease_back_in_array,
+    "back_out": ease_back_out_array,
+    "back_in_out": ease_back_in_out_array,
+    "anticipate": ease_back_in_array,
+    "overshoot": ease_back_out_array,
+}
+
+
+def get_easing_array(name: str = "linear") -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Get the array version of an easing function by name.
+
+    Curves registered only in EASING_FUNCTIONS are applied element-wise.
+    """
+    func = EASING_ARRAY_FUNCTIONS.get(name)
+    if func is not None:
+        return func
+    curve = _parse_cubic_bezier(name)
+    if curve is not None:
+        return curve.array
+    scalar = get_easing(name)
+    return lambda t: np.vectorize(scalar, otypes=[np.float64])(t)
+
+
+def interpolate_many(
+    start: float | np.ndarray,
+    end: float | np.ndarray,
+    ts: np.ndarray,
+    easing: str = "linear",
+) -> np.ndarray:
+    """
+    Interpolate a whole timeline of values with easing in one call.
+
+    start, end and ts broadcast together, so a frames x particles matrix is
+    ts shaped (frames, 1) with start/end shaped (particles,).
+
+    Args:
+        start: Start value(s)
+        end: End value(s)
+        ts: Progress values from 0.0 to 1.0
+        easing: Name of easing function
+
+    Returns:
+        Interpolated values
+    """
+    eased = get_easing_array(easing)(ts)
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    return start + (end - start) * eased
+
+
+class EasingLUT:
+    """
+    Easing curve sampled once into a dense table, evaluated by lookup + lerp.
+
+    t is clamped to [0, 1]. At the default 1024 intervals results are within
+    ~2e-3 of the exact curve (worst at bounce kinks and the steep start of
+    elastic); the error falls with the square of the resolution.
+    """
+
+    def __init__(self, easing: str = "linear", resolution: int = 1024):
+        """
+        Args:
+            easing: Name of easing function
+            resolution: Number of table intervals between t=0 and t=1
+        """
+        if resolution < 1:
+            raise ValueError(f"resolution must be at least 1, got {resolution}")
+        self.easing = easing
+        self.resolution = resolution
+
+        self.table = get_easing_array(easing)(np.linspace(0.0, 1.0, resolution + 1))
+        self.slopes = np.diff(self.table, append=self.table[-1])
+        self.scalar = _lut_scalar(self.table.tolist(), self.slopes.tolist())
+
+    def __call__(self, t: float | np.ndarray) -> float | np.ndarray:
+        """Eased value(s) for a single t or an array of t."""
+        if isinstance(t, np.ndarray):
+            return self.many(t)
+        return self.scalar(t)
+
+    def many(self, ts: np.ndarray) -> np.ndarray:
+        """Eased values for an array of t."""
+        x = np.clip(np.asarray(ts, dtype=np.float64), 0.0, 1.0) * self.resolution
+        i = x.astype(np.intp)
+        return self.table[i] + self.slopes[i] * (x - i)
+
+
+def _lut_scalar(values: list[float], steps: list[float]) -> Callable[[float], float]:
+    """Build the single-t lookup as a closure over plain lists (fastest in Python)."""
+    resolution = len(values) - 1
+    first, last = values[0], values[-1]
+
+    def ease(t: float) -> float:
+        if 0.0 < t < 1.0:
+            x = t * resolution
+            i = int(x)
+            return values[i] + steps[i] * (x - i)
+        return first if t <= 0.0 else last
+
+    return ease
+
+
+@lru_cache(maxsize=None)
+def get_easing_lut(name: str = "linear", resolution: int = 1024) -> EasingLUT:
+    """Get the cached lookup table for an easing function."""
+    return EasingLUT(name, resolution)
+
+
+class CubicBezier:
+    """
+    CSS-style cubic-bezier(x1, y1, x2, y2) easing curve.
+
+    The curve runs from (0, 0) to (1, 1) with control points (x1, y1) and
+    (x2, y2). For each t the curve parameter s with x(s) = t is found by
+    Newton-Raphson, falling back to bisection where the slope is too flat to
+    converge; the eased value is y(s). t is clamped to [0, 1].
+    """
+
+    NEWTON_ITERATIONS = 8
+    BISECTION_ITERATIONS = 40
+    EPSILON = 1e-7
+
+    def __init__(self, x1: float, y1: float, x2: float, y2: float):
+        """
+        Args:
+            x1, y1: First control point (x1 must be in [0, 1])
+            x2, y2: Second control point (x2 must be in [0, 1])
+        """
+        if not (0.0 <= x1 <= 1.0 and 0.0 <= x2 <= 1.0):
+            raise ValueError(
+                f"cubic_bezier x values must be in [0, 1], got x1={x1}, x2={x2}"
+            )
+        self.points = (float(x1), float(y1), float(x2), float(y2))
+
+        # Polynomial coefficients: x(s) = ((ax * s + bx) * s + cx) * s
+        self._cx = 3.0 * x1
+        self._bx = 3.0 * (x2 - x1) - self._cx
+        self._ax = 1.0 - self._cx - self._bx
+        self._cy = 3.0 * y1
+        self._by = 3.0 * (y2 - y1) - self._cy
+        self._ay = 1.0 - self._cy - self._by
+
+    def __repr__(self) -> str:
+        return "cubic_bezier({:g}, {:g}, {:g}, {:g})".format(*self.points)
+
+    def __call__(self, t: float) -> float:
+        """Eased value for a single t."""
+        if t <= 0.0:
+            return 0.0
+        if t >= 1.0:
+            return 1.0
+        ax, bx, cx = self._ax, self._bx, self._cx
+
+        s = t
+        for _ in range(self.NEWTON_ITERATIONS):
+            error = ((ax * s + bx) * s + cx) * s - t
+            if abs(error) < self.EPSILON:
+                break
+            slope = (3.0 * ax * s + 2.0 * bx) * s + cx
+            if abs(slope) < 1e-6:
+                s = self._bisect(t)
+                break
+            s -= error / slope
+        else:
+            if not 0.0 <= s <= 1.0 or abs(((ax * s + bx) * s + cx) * s - t) > 1e-5:
+                s = self._bisect(t)
+
+        return ((self._ay * s + self._by) * s + self._cy) * s
+
+    def array(self, t: np.ndarray) -> np.ndarray:
+        """Eased values for an array of t, solved for all elements at once."""
+        t = np.clip(np.asarray(t, dtype=np.float64), 0.0, 1.0)
+        shape = t.shape
+        t = t.reshape(-1)
+        ax, bx, cx = self._ax, self._bx, self._cx
+
+        s = t.copy()
+        for _ in range(self.NEWTON_ITERATIONS):
+            error = ((ax * s + bx) * s + cx) * s - t
+            if np.abs(error).max(initial=0.0) < self.EPSILON:
+                break
+            slope = (3.0 * ax * s + 2.0 * bx) * s + cx
+            # Flat spots are left for bisection
+            slope[np.abs(slope) < 1e-6] = np.inf
+            s -= error / slope
+        else:
+            error = ((ax * s + bx) * s + cx) * s - t
+
+        # Bisection only for elements Newton did not settle
+        unsolved = ~((np.abs(error) <= 1e-5) & (s >= 0.0) & (s <= 1.0))
+        if unsolved.any():
+            s[unsolved] = self._bisect_array(t[unsolved])
+
+        return (((self._ay * s + self._by) * s + self._cy) * s).reshape(shape)
+
+    def _bisect(self, t: float) -> float:
+        ax, bx, cx = self._ax, self._bx, self._cx
+        low, high = 0.0, 1.0
+        s = t
+        for _ in range(self.BISECTION_ITERATIONS):
+            s = 0.5 * (low + high)
+            if ((ax * s + bx) * s + cx) * s < t:
+                low = s
+            else:
+                high = s
+        return s
+
+    def _bisect_array(self, t: np.ndarray) -> np.ndarray:
+        ax, bx, cx = self._ax, self._bx, self._cx
+        low = np.zeros_like(t)
+        high = np.ones_like(t)
+        for _ in range(self.BISECTION_ITERATIONS):
+            s = 0.5 * (low + high)
+            below = ((ax * s + bx) * s + cx) * s < t
+            low = np.where(below, s, low)
+            high = np.where(below, high, s)
+        return 0.5 * (low + high)
+
+
+@lru_cache(maxsize=256)
+def cubic_bezier(x1: float, y1: float, x2: float, y2: float) -> CubicBezier:
+    """
+    Get a cubic-bezier easing curve, memoized by its control points.
+
+    The returned curve is callable with a single t; use .array() for arrays.
+    The same curve is also available by name, e.g.
+    get_easing("cubic_bezier(0.25, 0.1, 0.25, 1)"), so it can be used
+    anywhere an easing name is accepted.
+    """
+    return CubicBezier(x1, y1, x2, y2)
+
+
+@lru_cache(maxsize=256)
+def _parse_cubic_bezier(name: str) -> CubicBezier | None:
+    """Curve for a "cubic_bezier(x1, y1, x2, y2)" easing name, else None."""
+    name = name.replace(" ", "")
+    if not (name.startswith("cubic_bezier(") and name.endswith(")")):
+        return None
+    try:
+        values = [float(v) for v in name[len("cubic_bezier(") : -1].split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid cubic_bezier easing: {name}") from None
+    if len(values) != 4:
+        raise ValueError(f"cubic_bezier needs 4 values, got {len(values)}: {name}")
+    return cubic_bezier(*values)
@@ -6,7 +6,10 @@ Provides functions for drawing shapes, text, emojis, and compositing elements
 together to create animation frames.
 """
 
-from typing import Optional
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Hashable, Optional, Sequence
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
@@ -29,6 +32,51 @@ def create_blank_frame(
     return Image.new("RGB", (width, height), color)
 
 
+def downsample(frame: np.ndarray | Image.Image, factor: int) -> np.ndarray:
+    """
+    Box-filter a supersampled frame down by an integer factor.
+
+    Each output pixel is the rounded mean of a factor x factor block, which
+    anti-aliases shapes drawn at factor times the target size. Much cheaper
+    than a LANCZOS resize of the same frame.
+
+    Args:
+        frame: RGB frame whose width and height are multiples of factor
+        factor: Supersampling factor (e.g. 4 for 512x512 -> 128x128)
+
+    Returns:
+        RGB array of size (height // factor, width // factor)
+    """
+    if isinstance(frame, Image.Image):
+        frame = np.asarray(frame.convert("RGB"))
+    if factor == 1:
+        return np.asarray(frame)
+    if not 1 < factor <= 16:
+        raise ValueError(f"Supersample factor must be 1-16, got {factor}")
+
+    height, width, channels = frame.shape
+    if height % factor or width % factor:
+        raise ValueError(
+            f"Frame size {width}x{height} is not a multiple of factor {factor}"
+        )
+
+    # Sum row blocks, then column blocks, as strided slice adds (uint16 holds
+    # up to 16 x 16 x 255)
+    rows = np.ascontiguousarray(frame).reshape(height // factor, factor, -1)
+    summed = rows[:, 0].astype(np.uint16)
+    for i in range(1, factor):
+        summed += rows[:, i]
+    columns = summed.reshape(height // factor, width // factor, factor, channels)
+    out = columns[:, :, 0].copy()
+    for i in range(1, factor):
+        out += columns[:, :, i]
+
+    area = factor * factor
+    out += area // 2
+    out //= area
+    return out.astype(np.uint8)
+
+
 def draw_circle(
     frame: Image.Image,
     center: tuple[int, int],
@@ -51,8 +99,16 @@ def draw_circle(
     Returns:
         Modified frame
     """
-    draw = ImageDraw.Draw(frame)
     x, y = center
+    if _can_blit(frame, x, y, radius, extent=radius):
+        key = ("circle", radius, *_color_key(fill_color, outline_color), outline_width)
+        sprite = SPRITE_CACHE.get(
+            key,
+            lambda: _circle_sprite(radius, fill_color, outline_color, outline_width),
+        )
+        return blit_sprite(frame, sprite, (x - radius, y - radius))
+
+    draw = ImageDraw.Draw(frame)
     bbox = [x - radius, y - radius, x + radius, y + radius]
     draw.ellipse(bbox, fill=fill_color, outline=outline_color, width=outline_width)
     return frame
@@ -78,11 +134,23 @@ def draw_text(
     Returns:
         Modified frame
     """
-    draw = ImageDraw.Draw(frame)
-
     # Uses Pillow's default font.
     # If the font should be changed for the emoji, add additional logic here.
-    font = ImageFont.load_default()
+    font = _default_font()
+
+    # Single-line labels are rasterized once and pasted from the sprite cache
+    if "\n" not in text and _can_blit(frame, *position):
+        sprite = SPRITE_CACHE.get(
+            ("text", text, _color_key(color)), lambda: _text_sprite(text, color, font)
+        )
+        left, top = sprite.info["offset"]
+        x, y = position
+        if centered:
+            x -= sprite.width // 2
+            y -= sprite.height // 2
+        return blit_sprite(frame, sprite, (x + left, y + top))
+
+    draw = ImageDraw.Draw(frame)
 
     if centered:
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -96,42 +164,123 @@ def draw_text(
     return frame
 
 
+GRADIENT_KINDS = ("vertical", "horizontal", "radial")
+
+
 def create_gradient_background(
     width: int,
     height: int,
     top_color: tuple[int, int, int],
     bottom_color: tuple[int, int, int],
+    kind: str = "vertical",
+    colors: Optional[Sequence[tuple[int, int, int]]] = None,
+    stops: Optional[Sequence[float]] = None,
 ) -> Image.Image:
     """
-    Create a vertical gradient background.
+    Create a gradient background.
+
+    The gradient is computed once per (size, colors, kind) and cached; every
+    call returns a fresh copy, so drawing on it never touches the cache.
 
     Args:
         width: Frame width
         height: Frame height
-        top_color: RGB color at top
-        bottom_color: RGB color at bottom
+        top_color: RGB color at the start (top, left, or center for radial)
+        bottom_color: RGB color at the end (bottom, right, or edge for radial)
+        kind: 'vertical', 'horizontal' or 'radial'
+        colors: Optional list of RGB colors for a multi-stop gradient
+            (overrides top_color/bottom_color)
+        stops: Optional positions in [0, 1] for each color (default: even)
 
     Returns:
         PIL Image with gradient
     """
-    frame = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(frame)
+    return Image.fromarray(
+        gradient_array(width, height, top_color, bottom_color, kind, colors, stops)
+    )
 
-    # Calculate color step for each row
-    r1, g1, b1 = top_color
-    r2, g2, b2 = bottom_color
 
-    for y in range(height):
-        # Interpolate color
-        ratio = y / height
-        r = int(r1 * (1 - ratio) + r2 * ratio)
-        g = int(g1 * (1 - ratio) + g2 * ratio)
-        b = int(b1 * (1 - ratio) + b2 * ratio)
+def gradient_array(
+    width: int,
+    height: int,
+    top_color: tuple[int, int, int],
+    bottom_color: tuple[int, int, int],
+    kind: str = "vertical",
+    colors: Optional[Sequence[tuple[int, int, int]]] = None,
+    stops: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Get a cached gradient as a read-only (height, width, 3) uint8 array.
 
-        # Draw horizontal line
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    The array is shared between callers; use np.array(...) or
+    create_gradient_background() for a copy that can be drawn on.
 
-    return frame
+    Args:
+        width: Frame width
+        height: Frame height
+        top_color: RGB color at the start
+        bottom_color: RGB color at the end
+        kind: 'vertical', 'horizontal' or 'radial'
+        colors: Optional list of RGB colors for a multi-stop gradient
+        stops: Optional positions in [0, 1] for each color (default: even)
+
+    Returns:
+        Read-only RGB array
+    """
+    if kind not in GRADIENT_KINDS:
+        raise ValueError(f"kind must be one of {GRADIENT_KINDS}, got '{kind}'")
+    if colors is None:
+        colors = (top_color, bottom_color)
+    colors = tuple(tuple(int(c) for c in color) for color in colors)
+    if len(colors) < 2:
+        raise ValueError("A gradient needs at least two colors")
+
+    if stops is None:
+        stops = tuple(i / (len(colors) - 1) for i in range(len(colors)))
+    else:
+        stops = tuple(float(stop) for stop in stops)
+        if len(stops) != len(colors):
+            raise ValueError(f"Got {len(stops)} stops for {len(colors)} colors")
+        if any(b < a for a, b in zip(stops, stops[1:])):
+            raise ValueError("Gradient stops must be in increasing order")
+
+    return _cached_gradient(width, height, colors, kind, stops)
+
+
+@lru_cache(maxsize=16)
+def _cached_gradient(
+    width: int,
+    height: int,
+    colors: tuple[tuple[int, int, int], ...],
+    kind: str,
+    stops: tuple[float, ...],
+) -> np.ndarray:
+    # Gradient position of every row, column or pixel
+    if kind == "vertical":
+        ratio = (np.arange(height, dtype=np.float64) / height)[:, None]
+    elif kind == "horizontal":
+        ratio = (np.arange(width, dtype=np.float64) / width)[None, :]
+    else:
+        y, x = np.ogrid[:height, :width]
+        cx, cy = (width - 1) / 2, (height - 1) / 2
+        ratio = np.hypot(x - cx, y - cy) / max(np.hypot(cx, cy), 1e-9)
+
+    # Blend between the two stops surrounding each position
+    palette = np.array(colors, dtype=np.float64)
+    stop_array = np.array(stops, dtype=np.float64)
+    segment = np.clip(
+        np.searchsorted(stop_array, ratio, side="right") - 1, 0, len(stops) - 2
+    )
+    start = stop_array[segment]
+    span = stop_array[segment + 1] - start
+    local = np.clip((ratio - start) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+    local = local[..., None]
+    blended = palette[segment] * (1 - local) + palette[segment + 1] * local
+
+    gradient = np.empty((height, width, 3), dtype=np.uint8)
+    gradient[:] = blended.astype(np.uint8)
+    gradient.flags.writeable = False
+    return gradient
 
 
 def draw_star(
@@ -156,21 +305,215 @@ def draw_star(
     Returns:
         Modified frame
     """
-    import math
+    x, y = center
+    half = math.ceil(size) + outline_width + 1
+    if _can_blit(frame, x, y, extent=half):
+        key = ("star", size, *_color_key(fill_color, outline_color), outline_width)
+        sprite = SPRITE_CACHE.get(
+            key, lambda: _star_sprite(size, fill_color, outline_color, outline_width)
+        )
+        return blit_sprite(frame, sprite, (x - half, y - half))
 
     draw = ImageDraw.Draw(frame)
-    x, y = center
+    draw.polygon(
+        _star_points(x, y, size),
+        fill=fill_color,
+        outline=outline_color,
+        width=outline_width,
+    )
+    return frame
+
+
+# Star vertices: (radius ratio, cos, sin), 36 degrees per point starting at
+# the top, alternating between the outer and inner radius
+_STAR_UNIT = [
+    (
+        1.0 if i % 2 == 0 else 0.4,
+        math.cos((i * 36 - 90) * math.pi / 180),
+        math.sin((i * 36 - 90) * math.pi / 180),
+    )
+    for i in range(10)
+]
 
-    # Calculate star points
+
+def _star_points(x: float, y: float, size: float) -> list[tuple[float, float]]:
     points = []
-    for i in range(10):
-        angle = (i * 36 - 90) * math.pi / 180  # 36 degrees per point, start at top
-        radius = size if i % 2 == 0 else size * 0.4  # Alternate between outer and inner
-        px = x + radius * math.cos(angle)
-        py = y + radius * math.sin(angle)
-        points.append((px, py))
+    for ratio, cos, sin in _STAR_UNIT:
+        radius = size if ratio == 1.0 else size * ratio
+        points.append((x + radius * cos, y + radius * sin))
+    return points
+
+
+class SpriteCache:
+    """
+    LRU cache of rasterized RGBA sprites, bounded by memory.
+
+    Sprites are blitted with Image.paste using their own alpha as the mask,
+    which gives the same pixels as drawing the shape directly.
+    """
 
-    # Draw star
-    draw.polygon(points, fill=fill_color, outline=outline_color, width=outline_width)
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Evict least recently used sprites beyond this size
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sprites: OrderedDict[Hashable, Image.Image] = OrderedDict()
+
+    def get(self, key: Hashable, render: Callable[[], Image.Image]) -> Image.Image:
+        """
+        Get the sprite for key, rasterizing it with render() on a miss.
+
+        Args:
+            key: Hashable description of the sprite (shape, size, colors, ...)
+            render: Returns the sprite as an RGBA image
+
+        Returns:
+            Cached RGBA sprite (do not draw on it)
+        """
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = render()
+        self._sprites[key] = sprite
+        self.nbytes += sprite.width * sprite.height * 4
+        while self.nbytes > self.max_bytes and len(self._sprites) > 1:
+            _, evicted = self._sprites.popitem(last=False)
+            self.nbytes -= evicted.width * evicted.height * 4
+        return sprite
+
+    def clear(self):
+        """Drop all sprites and reset the counters."""
+        self._sprites.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and memory use."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._sprites),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+
+# Shared by draw_circle, draw_star and draw_text
+SPRITE_CACHE = SpriteCache()
+
+# Above this many pixels, drawing a circle or star directly is faster than
+# pasting its cached sprite
+_BLIT_MAX_PIXELS = 40 * 40
+
+
+def blit_sprite(
+    frame: Image.Image, sprite: Image.Image, position: tuple[int, int]
+) -> Image.Image:
+    """
+    Alpha-blend an RGBA sprite onto a frame.
+
+    Args:
+        frame: PIL Image to draw on
+        sprite: RGBA sprite (e.g. from SPRITE_CACHE)
+        position: (x, y) of the sprite's top-left corner; may be off-frame
 
+    Returns:
+        Modified frame
+    """
+    frame.paste(sprite, position, sprite)
     return frame
+
+
+def _can_blit(frame: Image.Image, *coords, extent: Optional[int] = None) -> bool:
+    """
+    Whether a shape can be pasted from the sprite cache.
+
+    Sprites land on whole pixels, so only integer positions qualify. Shapes
+    (extent = half the sprite size around the center at coords[:2]) must also
+    be small enough that pasting beats drawing, and lie fully inside the frame
+    so the result matches PIL's clipped rasterization.
+    """
+    if frame.mode != "RGB":
+        return False
+    if not all(isinstance(c, (int, np.integer)) for c in coords):
+        return False
+    if extent is None:
+        return True
+
+    x, y = coords[:2]
+    return (
+        (2 * extent + 1) ** 2 <= _BLIT_MAX_PIXELS
+        and extent <= x < frame.width - extent
+        and extent <= y < frame.height - extent
+    )
+
+
+def _color_key(*colors) -> tuple:
+    """Hashable form of RGB colors (which may be passed as lists)."""
+    return tuple(None if color is None else tuple(color) for color in colors)
+
+
+@lru_cache(maxsize=1)
+def _default_font() -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    return ImageFont.load_default()
+
+
+def _circle_sprite(
+    radius: int,
+    fill_color: Optional[tuple[int, int, int]],
+    outline_color: Optional[tuple[int, int, int]],
+    outline_width: int,
+) -> Image.Image:
+    size = 2 * radius + 1
+    sprite = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).ellipse(
+        [0, 0, 2 * radius, 2 * radius],
+        fill=fill_color,
+        outline=outline_color,
+        width=outline_width,
+    )
+    return sprite
+
+
+def _star_sprite(
+    size: float,
+    fill_color: tuple[int, int, int],
+    outline_color: Optional[tuple[int, int, int]],
+    outline_width: int,
+) -> Image.Image:
+    half = math.ceil(size) + outline_width + 1
+    sprite = Image.new("RGBA", (2 * half + 1, 2 * half + 1), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).polygon(
+        _star_points(half, half, size),
+        fill=fill_color,
+        outline=outline_color,
+        width=outline_width,
+    )
+    return sprite
+
+
+def _text_sprite(
+    text: str,
+    color: tuple[int, int, int],
+    font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+) -> Image.Image:
+    left, top, right, bottom = font.getbbox(text)
+    size = (max(1, right - left), max(1, bottom - top))
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    sprite = Image.new("RGBA", size, (*color, 0))
+    sprite.putalpha(mask)
+    sprite.info["offset"] = (left, top)
+    return sprite
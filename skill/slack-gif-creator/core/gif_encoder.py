@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+GIF Encoder - Write indexed frames as GIF blocks with a dedicated LZW encoder.
+
+Frames are palette indices (uint8 arrays). The encoder picks the smallest LZW
+minimum code size for the palette, reuses one global color table (frames may
+still bring a local one), and lets the caller choose what happens when the
+4096-entry LZW table fills up:
+
+- "reset":    emit a clear code and start a fresh table (what most encoders do)
+- "deferred": keep encoding with the full table and never clear, which wins
+              when the image keeps repeating the patterns already learned
+- "adaptive": keep the full table while it compresses well and clear once
+              pixels per code drop (as compress(1) does)
+
+Example:
+    with open('out.gif', 'wb') as f:
+        encoder = GIFEncoder(f, 128, 128, palette)
+        for indices in frames:
+            encoder.add_frame(indices, delay_cs=10)
+        encoder.finish()
+"""
+
+import struct
+from typing import BinaryIO, Callable, Optional, Sequence
+
+import numpy as np
+
+CLEAR_STRATEGIES = ("reset", "deferred", "adaptive")
+
+# Largest code GIF LZW can use (12-bit codes)
+MAX_CODE = 4095
+
+# "adaptive" clearing: codes per measurement window, and the fraction of the
+# best pixels-per-code ratio below which the full table is dropped
+ADAPTIVE_WINDOW = 256
+ADAPTIVE_DROP = 0.8
+
+
+def minimum_code_size(palette_size: int) -> int:
+    """
+    Smallest LZW minimum code size that can hold a palette's indices.
+
+    Args:
+        palette_size: Number of palette entries
+
+    Returns:
+        Code size in bits (2-8; GIF does not allow less than 2)
+    """
+    return max(2, (max(palette_size, 1) - 1).bit_length())
+
+
+def color_table_bits(palette_size: int) -> int:
+    """
+    Size field of a color table holding palette_size colors (2 ** (n + 1) entries).
+
+    Tables have at least 4 entries (as Pillow writes them), so even a 1-2
+    color palette leaves a spare slot for a delta frame's transparent index.
+    """
+    return max(2, (max(palette_size, 2) - 1).bit_length()) - 1
+
+
+def color_table(palette: np.ndarray) -> bytes:
+    """Palette as GIF color table bytes, padded to a power of two entries."""
+    palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+    entries = 2 ** (color_table_bits(len(palette)) + 1)
+    table = np.zeros((entries, 3), dtype=np.uint8)
+    table[: len(palette)] = palette
+    return table.tobytes()
+
+
+def lossy_substitutes(
+    palette: np.ndarray,
+    lossy: float,
+    table_size: int = 256,
+    transparency: Optional[int] = None,
+) -> list[tuple[int, ...]]:
+    """
+    For each index, the other indices whose colors are close enough to stand in.
+
+    Args:
+        palette: (N, 3) uint8 colors
+        lossy: Largest RGB distance allowed between a pixel and its stand-in
+        table_size: Number of index values to cover (slots past the palette,
+                    e.g. table padding, get no substitutes)
+        transparency: Transparent index; never substituted in either direction
+
+    Returns:
+        Per index, substitute indices ordered from closest to farthest
+    """
+    palette = np.asarray(palette, dtype=np.float64).reshape(-1, 3)
+    distances = np.sqrt(((palette[:, None] - palette[None]) ** 2).sum(axis=-1))
+    np.fill_diagonal(distances, np.inf)
+    if transparency is not None and transparency < len(palette):
+        distances[transparency, :] = np.inf
+        distances[:, transparency] = np.inf
+
+    substitutes: list[tuple[int, ...]] = [()] * table_size
+    for index in range(min(len(palette), table_size)):
+        order = np.argsort(distances[index], kind="stable")
+        close = order[distances[index, order] <= lossy]
+        substitutes[index] = tuple(close.tolist())
+    return substitutes
+
+
+def lzw_encode(
+    indices: np.ndarray | bytes,
+    min_code_size: int,
+    clear_strategy: str = "reset",
+    substitutes: Optional[Sequence[Sequence[int]]] = None,
+    changes: Optional[list[tuple[int, int]]] = None,
+) -> bytes:
+    """
+    LZW-compress palette indices into a packed GIF code stream.
+
+    With substitutes the encoding is lossy, as in gifsicle --lossy: each code
+    is the longest table string whose pixels all stay within the error budget
+    of the pixels they replace (see _longest_match), so codes cover more
+    pixels at the cost of small color errors.
+
+    Args:
+        indices: Palette indices in row order (every value < 2 ** min_code_size)
+        min_code_size: LZW minimum code size (see minimum_code_size)
+        clear_strategy: "reset", "deferred" or "adaptive" (see module docstring)
+        substitutes: Per-index stand-ins (see lossy_substitutes); None = lossless
+        changes: List that receives (position, index) for every pixel the
+                 lossy encoding decodes to a different index
+
+    Returns:
+        Packed code stream (without the code size byte or sub-block framing)
+    """
+    if clear_strategy not in CLEAR_STRATEGIES:
+        raise ValueError(
+            f"Unknown clear_strategy {clear_strategy!r}, use one of {CLEAR_STRATEGIES}"
+        )
+    data = indices.tobytes() if isinstance(indices, np.ndarray) else bytes(indices)
+    if data and max(data) >= 1 << min_code_size:
+        raise ValueError(f"Index {max(data)} does not fit {min_code_size}-bit codes")
+
+    clear = 1 << min_code_size
+    first_code = clear + 2
+
+    # Emitted codes, and the code width in effect from each change point on
+    codes = [clear]
+    width_changes = [(0, min_code_size + 1)]
+
+    # (prefix code << 8 | next index) -> code; this loop is the hot path, so
+    # bound methods are hoisted into locals
+    table: dict[int, int] = {}
+    lookup = table.get
+    emit = codes.append
+    next_code = first_code
+    code_size = min_code_size + 1
+    limit = 1 << code_size
+
+    # Pixels per code, only needed to judge a full table ("adaptive")
+    adaptive = clear_strategy == "adaptive"
+    lengths = [1] * (MAX_CODE + 1)
+    window_codes = window_pixels = 0
+    best_ratio = 0.0
+
+    if substitutes is not None:
+        # Stand-ins for each index, the index itself first
+        candidates = [(index, *substitutes[index]) for index in range(len(substitutes))]
+
+    size = len(data)
+    pos = 0
+    while pos < size:
+        if substitutes is None:
+            prefix = data[pos]
+            pos += 1
+            while pos < size:
+                code = lookup((prefix << 8) | data[pos])
+                if code is None:
+                    break
+                prefix = code
+                pos += 1
+        else:
+            prefix, pos, changed = _longest_match(lookup, data, pos, candidates)
+            if changed and changes is not None:
+                changes.extend(changed)
+
+        emit(prefix)
+        # The decoder adds its entry one code later, so widths grow once the
+        # code about to be assigned no longer fits
+        if next_code >= limit and code_size < 12:
+            code_size += 1
+            limit <<= 1
+            width_changes.append((len(codes), code_size))
+        if pos == size:
+            break
+
+        byte = data[pos]
+        if next_code < MAX_CODE:
+            table[(prefix << 8) | byte] = next_code
+            lengths[next_code] = lengths[prefix] + 1
+            next_code += 1
+            clear_now = False
+        elif clear_strategy == "reset":
+            clear_now = True
+        elif adaptive:
+            # Clear once a window of codes covers clearly fewer pixels than
+            # the best window since the table filled
+            window_codes += 1
+            window_pixels += lengths[prefix]
+            clear_now = False
+            if window_codes == ADAPTIVE_WINDOW:
+                ratio = window_pixels / window_codes
+                clear_now = ratio < best_ratio * ADAPTIVE_DROP
+                best_ratio = max(best_ratio, ratio)
+                window_codes = window_pixels = 0
+        else:
+            clear_now = False
+
+        if clear_now:
+            emit(clear)
+            table.clear()
+            next_code = first_code
+            code_size = min_code_size + 1
+            limit = 1 << code_size
+            width_changes.append((len(codes), code_size))
+            best_ratio = 0.0
+
+    emit(clear + 1)  # End of information
+
+    return _pack_codes(codes, width_changes)
+
+
+def _longest_match(
+    lookup: Callable[[int], Optional[int]],
+    data: bytes,
+    start: int,
+    candidates: Sequence[Sequence[int]],
+) -> tuple[int, int, tuple[tuple[int, int], ...]]:
+    """
+    Longest table string matching data[start:] within the error budget.
+
+    Searches depth-first through every table string that starts with the
+    exact pixel at start and continues with, at each later pixel, that pixel
+    or one of its stand-ins. Every string is visited at most once (the table
+    is a tree), so a search costs at most the size of the table.
+
+    Returns:
+        (code of the longest string, position just past it, (position, index)
+        for each pixel the string gives a different index)
+    """
+    size = len(data)
+    best_code, best_end, best_changes = data[start], start + 1, ()
+    stack = [(best_code, best_end, best_changes)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, pos, changes = pop()
+        if pos > best_end:
+            best_code, best_end, best_changes = node, pos, changes
+        if pos < size:
+            # Pushed farthest first, so exact matches are explored first and
+            # win ties
+            exact = data[pos]
+            for index in reversed(candidates[exact]):
+                child = lookup((node << 8) | index)
+                if child is not None:
+                    if index != exact:
+                        push((child, pos + 1, (*changes, (pos, index))))
+                    else:
+                        push((child, pos + 1, changes))
+    return best_code, best_end, best_changes
+
+
+def _pack_codes(codes: list[int], width_changes: list[tuple[int, int]]) -> bytes:
+    """Pack variable-width codes LSB-first into bytes, all codes at once."""
+    codes = np.asarray(codes, dtype=np.uint16)
+    starts = [start for start, _ in width_changes] + [len(codes)]
+    widths = np.repeat(
+        np.array([width for _, width in width_changes], dtype=np.uint8),
+        np.diff(starts),
+    )
+    bits = (codes[:, None] >> np.arange(12, dtype=np.uint16)) & 1
+    stream = bits[np.arange(12) < widths[:, None]].astype(np.uint8)
+    return np.packbits(stream, bitorder="little").tobytes()
+
+
+def sub_blocks(data: bytes) -> bytes:
+    """Split data into GIF sub-blocks (length byte + up to 255 bytes) plus terminator."""
+    view = memoryview(data)
+    chunks = []
+    for start in range(0, len(view), 255):
+        chunk = view[start : start + 255]
+        chunks.append(bytes((len(chunk),)))
+        chunks.append(chunk)
+    chunks.append(b"\x00")
+    return b"".join(chunks)
+
+
+class GIFEncoder:
+    """
+    Writes a GIF89a stream frame by frame to a binary file object.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        width: int,
+        height: int,
+        palette: np.ndarray,
+        loop: Optional[int] = 0,
+        clear_strategy: str = "reset",
+        lossy: float = 0,
+    ):
+        """
+        Args:
+            file: Writable binary file object
+            width: Logical screen width
+            height: Logical screen height
+            palette: Global color table, (N, 3) uint8 array (N <= 256)
+            loop: Loop count (0 = forever, None = play once)
+            clear_strategy: LZW table strategy: "reset", "deferred" or "adaptive"
+            lossy: Error budget for lossy LZW, as the largest RGB distance a
+                   pixel may be shifted by (0 = lossless)
+        """
+        palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        if not 1 <= len(palette) <= 256:
+            raise ValueError(f"Palette must have 1-256 colors, got {len(palette)}")
+        if clear_strategy not in CLEAR_STRATEGIES:
+            raise ValueError(
+                f"Unknown clear_strategy {clear_strategy!r},"
+                f" use one of {CLEAR_STRATEGIES}"
+            )
+        self.file = file
+        self.width = width
+        self.height = height
+        self.palette = palette
+        self.clear_strategy = clear_strategy
+        self.lossy = lossy
+        self.bytes_written = 0
+        # Global palette substitutes per transparent index, for lossy frames
+        self._substitutes: dict[Optional[int], list[tuple[int, ...]]] = {}
+        self.frame_count = 0
+
+        self._write(b"GIF89a")
+        self._write(
+            struct.pack(
+                "<HHBBB",
+                width,
+                height,
+                0x80
+                | (color_table_bits(len(palette)) << 4)  # Color resolution
+                | color_table_bits(len(palette)),
+                0,  # Background color index
+                0,  # No aspect ratio
+            )
+        )
+        self._write(color_table(palette))
+        if loop is not None:
+            self._write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01")
+            self._write(struct.pack("<HB", loop, 0))
+
+    def add_frame(
+        self,
+        indices: np.ndarray,
+        offset: tuple[int, int] = (0, 0),
+        delay_cs: int = 0,
+        disposal: int = 0,
+        transparency: Optional[int] = None,
+        palette: Optional[np.ndarray] = None,
+    ):
+        """
+        Encode and write one frame.
+
+        Args:
+            indices: (H, W) uint8 palette indices
+            offset: (x, y) of the frame on the logical screen
+            delay_cs: Delay in centiseconds
+            disposal: Disposal method (0-3)
+            transparency: Transparent palette index, if any
+            palette: Local color table for this frame (default: the global one)
+
+        Returns:
+            The frame's indices as decoders will show them (only differs from
+            indices with lossy)
+        """
+        indices = np.ascontiguousarray(indices, dtype=np.uint8)
+        height, width = indices.shape
+
+        flags = disposal << 2
+        if transparency is not None:
+            flags |= 0x01
+        self._write(
+            struct.pack(
+                "<BBBBHBB", 0x21, 0xF9, 4, flags, delay_cs, transparency or 0, 0
+            )
+        )
+
+        table_size = len(self.palette)
+        flags = 0
+        if palette is not None:
+            palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+            table_size = len(palette)
+            flags = 0x80 | color_table_bits(table_size)
+        self._write(
+            struct.pack("<BHHHHB", 0x2C, offset[0], offset[1], width, height, flags)
+        )
+        if palette is not None:
+            self._write(color_table(palette))
+
+        # Indices may use the padding slots of the table (e.g. transparency)
+        slots = 2 ** (color_table_bits(table_size) + 1)
+        code_size = minimum_code_size(slots)
+
+        # One entry per value a code_size-bit index can take, so any index in
+        # the frame has a (possibly empty) substitute list
+        substitutes = None
+        if self.lossy > 0:
+            alphabet = 1 << code_size
+            if palette is not None:
+                substitutes = lossy_substitutes(
+                    palette, self.lossy, alphabet, transparency
+                )
+            else:
+                substitutes = self._substitutes.get(transparency)
+                if substitutes is None:
+                    substitutes = lossy_substitutes(
+                        self.palette, self.lossy, alphabet, transparency
+                    )
+                    self._substitutes[transparency] = substitutes
+
+        changes: list[tuple[int, int]] = []
+        data = lzw_encode(indices, code_size, self.clear_strategy, substitutes, changes)
+        self._write(bytes((code_size,)))
+        self._write(sub_blocks(data))
+        self.frame_count += 1
+
+        if not changes:
+            return indices
+        positions, values = zip(*changes)
+        shown = indices.copy()
+        shown.flat[list(positions)] = values
+        return shown
+
+    def finish(self):
+        """Write the GIF trailer (the file is left open)."""
+        self._write(b";")
+
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self.bytes_written += len(data)
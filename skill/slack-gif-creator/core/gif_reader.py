@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+GIF Reader - Block-level GIF parsing without decoding pixels.
+
+Walks the GIF structure (header, logical screen descriptor, extensions and
+image descriptors) and skips compressed image data by its sub-block lengths,
+so frame count, per-frame delays, palette sizes and frame rectangles come
+from a single pass over the bytes.
+
+GIFReader memory-maps a file instead of reading it, exposes each frame's
+compressed data as a zero-copy view, and LZW-decodes only the frames that are
+actually requested, so memory stays flat on very large files.
+
+Example:
+    info = scan_gif('party.gif')
+    print(info.width, info.height, info.frame_count, info.durations)
+
+    with GIFReader('party.gif') as reader:
+        indices = reader.decode(0)        # palette indices of frame 0 only
+        for frame in reader.frames():     # composited RGBA, one at a time
+            ...
+"""
+
+import io
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from PIL import Image
+
+# Full sub-blocks checked per strided window when skipping image data
+_SKIP_WINDOW = 512
+
+# Block introducers and extension labels
+EXTENSION = 0x21
+IMAGE_DESCRIPTOR = 0x2C
+TRAILER = 0x3B
+GRAPHIC_CONTROL = 0xF9
+APPLICATION = 0xFF
+
+# Browsers (and Slack) play GIF delays below this as 100 ms
+MIN_GIF_DELAY_MS = 20
+
+
+class GIFFrame:
+    """Metadata of one image in a GIF, plus where its compressed data lives."""
+
+    def __init__(
+        self,
+        index: int,
+        left: int,
+        top: int,
+        width: int,
+        height: int,
+        delay_ms: int = 0,
+        disposal: int = 0,
+        transparent_index: Optional[int] = None,
+        palette_size: int = 0,
+        local_palette: bool = False,
+        interlaced: bool = False,
+        lzw_min_code_size: int = 8,
+        data_start: int = 0,
+        data_end: int = 0,
+    ):
+        """
+        Args:
+            index: Frame number
+            left, top, width, height: Frame rectangle on the logical screen
+            delay_ms: Delay from the graphic control extension (0 if none)
+            disposal: Disposal method from the graphic control extension
+            transparent_index: Transparent palette index, if any
+            palette_size: Entries in the palette this frame uses
+            local_palette: True if the frame has its own color table
+            interlaced: True if rows are stored interlaced
+            lzw_min_code_size: LZW minimum code size of the image data
+            data_start: Offset of the first image data sub-block
+            data_end: Offset just past the image data terminator
+        """
+        self.index = index
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.delay_ms = delay_ms
+        self.disposal = disposal
+        self.transparent_index = transparent_index
+        self.palette_size = palette_size
+        self.local_palette = local_palette
+        self.interlaced = interlaced
+        self.lzw_min_code_size = lzw_min_code_size
+        self.data_start = data_start
+        self.data_end = data_end
+
+    @property
+    def playback_delay_ms(self) -> int:
+        """Delay the frame is actually shown for (browsers play < 20 ms as 100 ms)."""
+        return self.delay_ms if self.delay_ms >= MIN_GIF_DELAY_MS else 100
+
+    @property
+    def rect(self) -> tuple[int, int, int, int]:
+        """(left, top, right, bottom) on the logical screen."""
+        return (self.left, self.top, self.left + self.width, self.top + self.height)
+
+    def __repr__(self) -> str:
+        return (
+            f"GIFFrame(index={self.index}, rect={self.rect}, "
+            f"delay_ms={self.delay_ms}, palette_size={self.palette_size})"
+        )
+
+
+class GIFInfo:
+    """Structure of a GIF file: screen size, palette and frames."""
+
+    def __init__(
+        self,
+        version: str,
+        width: int,
+        height: int,
+        global_palette_size: int,
+        background_index: int,
+        loop_count: Optional[int],
+        frames: list[GIFFrame],
+    ):
+        self.version = version
+        self.width = width
+        self.height = height
+        self.global_palette_size = global_palette_size
+        self.background_index = background_index
+        # None when there is no NETSCAPE2.0 extension (play once); 0 = forever
+        self.loop_count = loop_count
+        self.frames = frames
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frames)
+
+    @property
+    def durations(self) -> list[int]:
+        """Per-frame delays in milliseconds."""
+        return [frame.delay_ms for frame in self.frames]
+
+    @property
+    def total_duration_ms(self) -> int:
+        return sum(frame.delay_ms for frame in self.frames)
+
+    @property
+    def playback_durations(self) -> list[int]:
+        """Per-frame delays as played (see GIFFrame.playback_delay_ms)."""
+        return [frame.playback_delay_ms for frame in self.frames]
+
+    @property
+    def playback_duration_ms(self) -> int:
+        return sum(self.playback_durations)
+
+
+def parse_gif(data: bytes | memoryview) -> GIFInfo:
+    """
+    Parse GIF structure from a buffer.
+
+    Args:
+        data: Whole GIF file contents (bytes, memoryview or mmap)
+
+    Returns:
+        GIFInfo with one GIFFrame per image descriptor
+
+    Raises:
+        ValueError: If the data is not a GIF or is truncated inside a block
+    """
+    size = len(data)
+    if size < 13 or bytes(data[:3]) != b"GIF":
+        raise ValueError("Not a GIF file")
+    version = bytes(data[3:6]).decode("ascii", "replace")
+
+    width, height, packed, background_index = struct.unpack_from("<HHBB", data, 6)
+    pos = 13
+    global_palette_size = 0
+    if packed & 0x80:
+        global_palette_size = 2 ** ((packed & 0x07) + 1)
+        pos += 3 * global_palette_size
+
+    view = np.frombuffer(data, dtype=np.uint8)
+    frames: list[GIFFrame] = []
+    loop_count = None
+    # Graphic control values waiting for the next image
+    delay_ms, disposal, transparent_index = 0, 0, None
+
+    while pos < size:
+        block = data[pos]
+        pos += 1
+
+        if block == TRAILER:
+            break
+
+        if block == EXTENSION:
+            if pos >= size:
+                raise ValueError("Truncated GIF: extension without label")
+            label = data[pos]
+            pos += 1
+            if label == GRAPHIC_CONTROL and pos + 5 <= size and data[pos] >= 4:
+                flags, delay, transparent = struct.unpack_from("<BHB", data, pos + 1)
+                delay_ms = delay * 10
+                disposal = (flags >> 2) & 0x07
+                transparent_index = transparent if flags & 0x01 else None
+            elif (
+                label == APPLICATION
+                and pos + 15 <= size
+                and bytes(data[pos + 1 : pos + 12]) == b"NETSCAPE2.0"
+                and data[pos + 12] >= 3
+                and data[pos + 13] == 1
+            ):
+                (loop_count,) = struct.unpack_from("<H", data, pos + 14)
+            pos = _skip_sub_blocks(data, pos, size)
+
+        elif block == IMAGE_DESCRIPTOR:
+            if pos + 10 > size:
+                raise ValueError("Truncated GIF: incomplete image descriptor")
+            left, top, frame_width, frame_height, flags = struct.unpack_from(
+                "<HHHHB", data, pos
+            )
+            pos += 9
+            palette_size = global_palette_size
+            if flags & 0x80:
+                palette_size = 2 ** ((flags & 0x07) + 1)
+                pos += 3 * palette_size
+            if pos >= size:
+                raise ValueError("Truncated GIF: image without data")
+            min_code_size = data[pos]
+            data_start = pos + 1
+            pos = _skip_image_data(view, data_start, size)
+
+            frames.append(
+                GIFFrame(
+                    index=len(frames),
+                    left=left,
+                    top=top,
+                    width=frame_width,
+                    height=frame_height,
+                    delay_ms=delay_ms,
+                    disposal=disposal,
+                    transparent_index=transparent_index,
+                    palette_size=palette_size,
+                    local_palette=bool(flags & 0x80),
+                    interlaced=bool(flags & 0x40),
+                    lzw_min_code_size=min_code_size,
+                    data_start=data_start,
+                    data_end=pos,
+                )
+            )
+            delay_ms, disposal, transparent_index = 0, 0, None
+
+        elif block == 0x00:
+            # Stray padding some encoders leave between blocks
+            continue
+
+        else:
+            raise ValueError(f"Unknown GIF block 0x{block:02x} at offset {pos - 1}")
+
+    return GIFInfo(
+        version=version,
+        width=width,
+        height=height,
+        global_palette_size=global_palette_size,
+        background_index=background_index,
+        loop_count=loop_count,
+        frames=frames,
+    )
+
+
+class GIFReader:
+    """
+    Memory-mapped GIF with frames decoded on demand.
+
+    Views returned by image_data() point into the mapping and are only valid
+    until the reader is closed.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: Path to a GIF file
+        """
+        self.path = Path(path)
+        # The mapping keeps its own handle, so the file can be closed at once
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.info = parse_gif(self._map)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Release the mapping."""
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views from image_data() are still alive; the mapping is
+                # released with the last of them
+                pass
+            self._map = None
+
+    def __enter__(self) -> "GIFReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.info.frame_count
+
+    def header_blocks(self) -> bytes:
+        """Logical screen descriptor and global color table, as stored."""
+        return self._map[6 : 13 + 3 * self.info.global_palette_size]
+
+    def image_data(self, index: int) -> memoryview:
+        """
+        Compressed image data of a frame, without copying.
+
+        Returns:
+            View of the LZW minimum code size byte followed by the data
+            sub-blocks and their terminator, exactly as stored in the file
+        """
+        frame = self.info.frames[index]
+        return memoryview(self._map)[frame.data_start - 1 : frame.data_end]
+
+    def palette(self, index: int) -> np.ndarray:
+        """
+        Color table a frame uses (its local table, else the global one).
+
+        Returns:
+            (palette_size, 3) uint8 array
+        """
+        frame = self.info.frames[index]
+        if frame.local_palette:
+            start = frame.data_start - 1 - 3 * frame.palette_size
+        else:
+            start = 13
+        table = self._map[start : start + 3 * frame.palette_size]
+        return np.frombuffer(table, dtype=np.uint8).reshape(-1, 3)
+
+    def decode(self, index: int) -> np.ndarray:
+        """
+        LZW-decode one frame into palette indices.
+
+        Only this frame's data is decoded; the rows are de-interlaced.
+
+        Returns:
+            (height, width) uint8 array of palette indices
+        """
+        frame = self.info.frames[index]
+        if frame.width == 0 or frame.height == 0:
+            return np.zeros((frame.height, frame.width), dtype=np.uint8)
+
+        # Wrap the frame's data in a minimal single-image GIF for Pillow's
+        # decoder. The color table only has to make Pillow keep mode "P";
+        # indices are read back directly.
+        depth = max(1, min(8, frame.lzw_min_code_size))
+        header = b"GIF89a" + struct.pack(
+            "<HHBBB", frame.width, frame.height, 0x80 | (depth - 1), 0, 0
+        )
+        table = _INDEX_PALETTE[: 3 * 2**depth]
+        descriptor = struct.pack(
+            "<BHHHHB",
+            IMAGE_DESCRIPTOR,
+            0,
+            0,
+            frame.width,
+            frame.height,
+            0x40 if frame.interlaced else 0,
+        )
+        data = header + table + descriptor + self.image_data(index) + b";"
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            if image.mode != "P":
+                raise ValueError(f"Unexpected decoded mode {image.mode}")
+            return np.asarray(image)
+
+    def frames(self) -> Iterator[Image.Image]:
+        """
+        Yield every frame composited onto the logical screen, one at a time.
+
+        Disposal methods and transparency are applied; the screen starts
+        fully transparent.
+
+        Yields:
+            RGBA images of the logical screen size
+        """
+        info = self.info
+        canvas = np.zeros((info.height, info.width, 4), dtype=np.uint8)
+        for frame in info.frames:
+            x0, y0 = min(frame.left, info.width), min(frame.top, info.height)
+            x1 = min(frame.left + frame.width, info.width)
+            y1 = min(frame.top + frame.height, info.height)
+            if frame.disposal == 3:
+                saved = canvas[y0:y1, x0:x1].copy()
+
+            indices = self.decode(frame.index)[: y1 - y0, : x1 - x0]
+            colors = np.zeros((256, 4), dtype=np.uint8)
+            palette = self.palette(frame.index)
+            colors[: len(palette), :3] = palette
+            colors[: len(palette), 3] = 255
+            if frame.transparent_index is not None:
+                colors[frame.transparent_index, 3] = 0
+            pixels = colors[indices]
+            region = canvas[y0:y1, x0:x1]
+            opaque = pixels[..., 3] > 0
+            region[opaque] = pixels[opaque]
+
+            yield Image.fromarray(canvas.copy(), "RGBA")
+
+            if frame.disposal == 2:
+                region[:] = 0
+            elif frame.disposal == 3:
+                region[:] = saved
+
+
+# Distinct, non-gray colors so Pillow keeps decoded frames in mode "P"
+_INDEX_PALETTE = bytes(
+    channel for i in range(256) for channel in (i, 255 - i, (i * 7) % 256)
+)
+
+
+def scan_gif(source: str | Path | bytes) -> GIFInfo:
+    """
+    Read a GIF's structure without decoding any pixels.
+
+    Files are memory-mapped rather than read, so only the pages holding block
+    headers are touched.
+
+    Args:
+        source: Path to a GIF file, or its contents
+
+    Returns:
+        GIFInfo (see parse_gif)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return parse_gif(source)
+    with GIFReader(source) as reader:
+        return reader.info
+
+
+def _skip_sub_blocks(data: bytes | memoryview, pos: int, size: int) -> int:
+    """Return the offset just past a chain of data sub-blocks."""
+    while True:
+        if pos >= size:
+            raise ValueError("Truncated GIF: missing block terminator")
+        length = data[pos]
+        pos += 1
+        if length == 0:
+            return pos
+        pos += length
+
+
+def _skip_image_data(view: np.ndarray, pos: int, size: int) -> int:
+    """
+    Return the offset just past image data sub-blocks.
+
+    Encoders write image data as runs of full 255-byte sub-blocks, so a run
+    is found with one strided comparison instead of a Python step per block.
+    """
+    while True:
+        lengths = view[pos : min(size, pos + 256 * _SKIP_WINDOW) : 256]
+        if len(lengths) == 0:
+            raise ValueError("Truncated GIF: missing block terminator")
+        partial = np.flatnonzero(lengths != 255)
+        if len(partial) == 0:
+            pos += 256 * len(lengths)
+            continue
+        pos += 256 * int(partial[0])
+        length = int(view[pos])
+        pos += 1
+        if length == 0:
+            return pos
+        pos += length
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Palette - Palette construction and vectorized palette application for GIF frames.
+
+Builds palettes from a compact color histogram (median cut or mini-batch
+k-means) and maps whole stacks of RGB frames to palette indices in one NumPy
+pass using a precomputed RGB lookup cube.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+# Bits kept per channel when indexing the lookup cube (32x32x32 cells)
+CUBE_BITS = 5
+
+# Pixels mapped per block in apply_palette()
+_BLOCK_PIXELS = 1 << 18
+
+# 4x4 Bayer matrix, normalized to thresholds in [-0.5, 0.5)
+BAYER_4X4 = (
+    np.array(
+        [
+            [0, 8, 2, 10],
+            [12, 4, 14, 6],
+            [3, 11, 1, 9],
+            [15, 7, 13, 5],
+        ],
+        dtype=np.float32,
+    )
+    / 16.0
+    - 0.5
+)
+
+
+def palette_colors(
+    palette: Sequence[tuple[int, int, int]] | np.ndarray | Image.Image,
+) -> np.ndarray:
+    """
+    Normalize a palette to an (N, 3) uint8 array.
+
+    Args:
+        palette: RGB tuples, an (N, 3) array or a "P" mode PIL Image
+
+    Returns:
+        Palette colors as (N, 3) uint8 array
+    """
+    if isinstance(palette, Image.Image):
+        if palette.mode != "P":
+            raise ValueError(f"Palette image must be mode 'P', got '{palette.mode}'")
+        palette = palette.getpalette()
+
+    colors = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+    if not 1 <= len(colors) <= 256:
+        raise ValueError(f"Palette must have 1-256 colors, got {len(colors)}")
+    return colors
+
+
+@lru_cache(maxsize=32)
+def _cached_cube(palette_bytes: bytes, bits: int) -> np.ndarray:
+    palette = np.frombuffer(palette_bytes, dtype=np.uint8).reshape(-1, 3)
+    palette = palette.astype(np.float32)
+
+    # Centers of every cube cell, in RGB space
+    levels = 1 << bits
+    step = 256 / levels
+    axis = (np.arange(levels, dtype=np.float32) + 0.5) * step
+    centers = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1)
+    centers = centers.reshape(-1, 3)
+
+    # Nearest palette entry per cell: |c|^2 - 2 c.p + |p|^2, in chunks to
+    # bound the (cells x colors) distance matrix
+    palette_norm = np.sum(palette * palette, axis=1)
+    cube = np.empty(len(centers), dtype=np.uint8)
+    chunk = 4096
+    for start in range(0, len(centers), chunk):
+        block = centers[start : start + chunk]
+        distances = palette_norm - 2.0 * (block @ palette.T)
+        cube[start : start + chunk] = np.argmin(distances, axis=1)
+
+    cube.flags.writeable = False
+    return cube
+
+
+def build_lookup_cube(palette: np.ndarray, bits: int = CUBE_BITS) -> np.ndarray:
+    """
+    Build (or fetch from cache) the RGB -> palette index lookup cube.
+
+    The cube is flat, indexed by (r >> s) << 2b | (g >> s) << b | (b >> s)
+    where b = bits and s = 8 - bits.
+
+    Args:
+        palette: Palette colors as (N, 3) uint8 array
+        bits: Bits kept per channel (5 = 32x32x32 cube)
+
+    Returns:
+        Read-only flat uint8 array of palette indices
+    """
+    palette = np.ascontiguousarray(palette, dtype=np.uint8)
+    return _cached_cube(palette.tobytes(), bits)
+
+
+def apply_palette(
+    frames: np.ndarray,
+    palette: np.ndarray,
+    dither: Optional[str] = None,
+    bits: int = CUBE_BITS,
+) -> np.ndarray:
+    """
+    Map RGB frames to palette indices in a single vectorized pass.
+
+    Args:
+        frames: RGB data shaped (..., H, W, 3), e.g. one frame or an (N, H, W, 3) stack
+        palette: Palette colors as (N, 3) uint8 array
+        dither: None for nearest color, or "ordered" for 4x4 Bayer dithering
+        bits: Bits kept per channel in the lookup cube
+
+    Returns:
+        uint8 array of palette indices shaped (..., H, W)
+    """
+    cube = build_lookup_cube(palette, bits)
+    shift = 8 - bits
+    height, width = frames.shape[-3:-1]
+
+    if dither is None:
+        offset = None
+    elif dither == "ordered":
+        threshold = np.tile(BAYER_4X4, ((height + 3) // 4, (width + 3) // 4))
+        # Spread by one cube cell so neighbouring pixels land in adjacent cells
+        offset = (threshold[:height, :width, None] * (1 << shift)).astype(np.int16)
+    else:
+        raise ValueError(f"Unknown dither mode: {dither!r} (use None or 'ordered')")
+
+    # Work in blocks of whole frames so temporaries stay cache-sized
+    stack = frames.reshape(-1, height, width, 3)
+    indices = np.empty(stack.shape[:-1], dtype=np.uint8)
+    block = max(1, _BLOCK_PIXELS // max(1, height * width))
+    for start in range(0, len(stack), block):
+        chunk = stack[start : start + block]
+        if offset is None:
+            channels = chunk >> shift
+        else:
+            channels = np.clip(chunk.astype(np.int16) + offset, 0, 255) >> shift
+
+        # uint16 keys: 2 bytes per pixel (15 bits for a 5-bit cube)
+        keys = channels[..., 0].astype(np.uint16) << (2 * bits)
+        keys |= channels[..., 1].astype(np.uint16) << bits
+        keys |= channels[..., 2].astype(np.uint16)
+        indices[start : start + block] = cube[keys]
+
+    return indices.reshape(frames.shape[:-1])
+
+
+def indices_to_rgb(indices: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """
+    Expand palette indices back to RGB.
+
+    Args:
+        indices: uint8 palette indices shaped (..., H, W)
+        palette: Palette colors as (N, 3) uint8 array
+
+    Returns:
+        RGB uint8 array shaped (..., H, W, 3)
+    """
+    return palette[indices]
+
+
+class ColorHistogram:
+    """Compact color histogram accumulated from sampled frame pixels."""
+
+    def __init__(self, bits: int = CUBE_BITS, sample_budget: int = 16384):
+        """
+        Initialize histogram.
+
+        Args:
+            bits: Bits kept per channel when binning colors (5 = 32768 bins)
+            sample_budget: Maximum pixels sampled per frame (stride sampling)
+        """
+        self.bits = bits
+        self.sample_budget = sample_budget
+        bins = 1 << (3 * bits)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        # Per-bin channel sums, so each bin reports its mean color, not its center
+        self.sums = np.zeros((bins, 3), dtype=np.float64)
+        self._frames_seen = 0
+
+    def add(self, frame: np.ndarray):
+        """
+        Add a sample of a frame's pixels.
+
+        Args:
+            frame: RGB uint8 array shaped (H, W, 3)
+        """
+        pixels = frame.reshape(-1, 3)
+        stride = max(1, -(-len(pixels) // self.sample_budget))
+        # A stride sharing a factor with the width would revisit the same
+        # columns on every row and miss narrow vertical features entirely
+        while stride > 1 and math.gcd(stride, frame.shape[1]) != 1:
+            stride += 1
+        # Rotate the starting pixel per frame so strides don't alias with patterns
+        sample = pixels[self._frames_seen % stride :: stride]
+        self._frames_seen += 1
+
+        shift = 8 - self.bits
+        keys = (sample[:, 0].astype(np.intp) >> shift) << (2 * self.bits)
+        keys |= (sample[:, 1].astype(np.intp) >> shift) << self.bits
+        keys |= sample[:, 2].astype(np.intp) >> shift
+
+        bins = len(self.counts)
+        self.counts += np.bincount(keys, minlength=bins)
+        for channel in range(3):
+            self.sums[:, channel] += np.bincount(
+                keys, weights=sample[:, channel], minlength=bins
+            )
+
+    def __getstate__(self) -> dict:
+        # Only occupied bins, so histograms pickle to kilobytes, not megabytes
+        occupied = np.flatnonzero(self.counts)
+        return {
+            "bits": self.bits,
+            "sample_budget": self.sample_budget,
+            "frames_seen": self._frames_seen,
+            "occupied": occupied,
+            "counts": self.counts[occupied],
+            "sums": self.sums[occupied],
+        }
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["bits"], state["sample_budget"])
+        self._frames_seen = state["frames_seen"]
+        self.counts[state["occupied"]] = state["counts"]
+        self.sums[state["occupied"]] = state["sums"]
+
+    def merge(self, other: "ColorHistogram"):
+        """
+        Add another histogram's samples to this one.
+
+        Args:
+            other: Histogram binned with the same bits
+        """
+        if other.bits != self.bits:
+            raise ValueError(f"Cannot merge {other.bits}-bit into {self.bits}-bit")
+        self.counts += other.counts
+        self.sums += other.sums
+
+    def colors(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the occupied bins.
+
+        Returns:
+            Tuple of (mean colors: float (K, 3), weights: pixel counts (K,))
+        """
+        occupied = np.flatnonzero(self.counts)
+        weights = self.counts[occupied]
+        return self.sums[occupied] / weights[:, None], weights
+
+    def __len__(self) -> int:
+        """Number of sampled pixels."""
+        return int(self.counts.sum())
+
+
+def median_cut(colors: np.ndarray, weights: np.ndarray, num_colors: int) -> np.ndarray:
+    """
+    Weighted median-cut palette over histogram colors.
+
+    Repeatedly splits the box with the largest weighted squared error along
+    its highest-variance channel, at the weighted median.
+
+    Args:
+        colors: Histogram colors, float (K, 3)
+        weights: Pixel count per color (K,)
+        num_colors: Maximum palette size
+
+    Returns:
+        Palette colors as float (<= num_colors, 3) array (weighted box means)
+    """
+
+    def box(indices: np.ndarray) -> tuple[float, np.ndarray, np.ndarray]:
+        box_colors = colors[indices]
+        box_weights = weights[indices].astype(np.float64)
+        mean = box_weights @ box_colors / box_weights.sum()
+        variance = box_weights @ (box_colors - mean) ** 2
+        error = float(variance.sum()) if len(indices) > 1 else -1.0
+        return error, indices, variance
+
+    boxes = [box(np.arange(len(colors)))]
+    while len(boxes) < num_colors:
+        target = max(range(len(boxes)), key=lambda i: boxes[i][0])
+        error, indices, variance = boxes[target]
+        if error <= 0:
+            break  # Every remaining box is a single color
+
+        channel = int(np.argmax(variance))
+        order = indices[np.argsort(colors[indices, channel], kind="stable")]
+        cumulative = np.cumsum(weights[order])
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2))
+        split = min(max(split, 1), len(order) - 1)
+
+        boxes[target] = box(order[:split])
+        boxes.append(box(order[split:]))
+
+    return np.array(
+        [
+            weights[indices] @ colors[indices] / weights[indices].sum()
+            for _, indices, _ in boxes
+        ]
+    )
+
+
+def kmeans(
+    colors: np.ndarray,
+    weights: np.ndarray,
+    num_colors: int,
+    iterations: int = 24,
+    batch_size: int = 2048,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Mini-batch k-means palette over histogram colors, seeded with median cut.
+
+    Args:
+        colors: Histogram colors, float (K, 3)
+        weights: Pixel count per color (K,)
+        num_colors: Maximum palette size
+        iterations: Mini-batch updates
+        batch_size: Histogram colors sampled (by weight) per update
+        seed: Random seed, so palettes are reproducible
+
+    Returns:
+        Palette colors as float (<= num_colors, 3) array
+    """
+    centers = median_cut(colors, weights, num_colors)
+    if len(colors) <= len(centers):
+        return centers
+
+    rng = np.random.default_rng(seed)
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    seen = np.zeros(len(centers))
+
+    for _ in range(iterations):
+        # Sample histogram colors in proportion to their pixel counts
+        picks = np.searchsorted(cumulative, rng.random(batch_size) * cumulative[-1])
+        batch = colors[np.minimum(picks, len(colors) - 1)]
+        nearest = _nearest(batch, centers)
+        counts = np.bincount(nearest, minlength=len(centers))
+        sums = np.stack(
+            [
+                np.bincount(nearest, weights=batch[:, c], minlength=len(centers))
+                for c in range(3)
+            ],
+            axis=1,
+        )
+        # Per-center learning rate 1/seen, as in Sculley's mini-batch k-means
+        seen += counts
+        moved = counts > 0
+        centers[moved] += (sums[moved] - counts[moved, None] * centers[moved]) / seen[
+            moved, None
+        ]
+
+    # Final full weighted assignment over the (small) histogram
+    nearest = _nearest(colors, centers)
+    totals = np.bincount(nearest, weights=weights, minlength=len(centers))
+    for c in range(3):
+        channel_sums = np.bincount(
+            nearest, weights=weights * colors[:, c], minlength=len(centers)
+        )
+        used = totals > 0
+        centers[used, c] = channel_sums[used] / totals[used]
+    return centers
+
+
+def palette_from_histogram(
+    histogram: ColorHistogram, num_colors: int = 128, method: str = "median_cut"
+) -> np.ndarray:
+    """
+    Build a palette from a color histogram.
+
+    Args:
+        histogram: Histogram of sampled frame colors
+        num_colors: Maximum palette size (1-256)
+        method: "median_cut" (fast) or "kmeans" (refined, slightly better)
+
+    Returns:
+        Palette colors as (<= num_colors, 3) uint8 array
+    """
+    if len(histogram) == 0:
+        raise ValueError("Color histogram is empty. Add frames first.")
+
+    colors, weights = histogram.colors()
+    if method == "kmeans":
+        centers = kmeans(colors, weights, num_colors)
+    elif method == "median_cut":
+        centers = median_cut(colors, weights, num_colors)
+    else:
+        raise ValueError(f"Unknown palette method: {method!r}")
+
+    palette = np.clip(np.rint(centers), 0, 255).astype(np.uint8)
+    return np.unique(palette, axis=0)
+
+
+def _nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Index of the nearest center for each point."""
+    points = points.astype(np.float32)
+    centers = centers.astype(np.float32)
+    distances = np.sum(centers * centers, axis=1) - 2.0 * (points @ centers.T)
+    return np.argmin(distances, axis=1)
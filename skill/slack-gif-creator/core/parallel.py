@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Parallel - Fan per-frame work out across a process pool.
+
+Frame stacks are placed in shared memory so worker processes read their
+input and write their output in place instead of pickling frames back and
+forth. Each worker handles a contiguous range of frames, so output order is
+always the input order.
+"""
+
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import parent_process, shared_memory, util
+from typing import Callable, Optional
+
+import numpy as np
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_pid = 0
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Turn a workers option into a process count.
+
+    Args:
+        workers: Number of processes, or None/0 for one per CPU
+
+    Returns:
+        Process count (at least 1)
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the module-level process pool, (re)creating it with the given size.
+
+    The pool is shared by every GIFBuilder in the process, so interpreter and
+    import startup is paid once rather than per GIF. A forked child (e.g. a
+    batch worker) gets its own pool rather than the parent's.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _executor, _executor_workers, _executor_pid
+
+    if (
+        _executor is None
+        or _executor_workers != workers
+        or _executor_pid != os.getpid()
+    ):
+        shutdown_executor()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+        _executor_pid = os.getpid()
+        if parent_process() is not None:
+            # Worker processes skip atexit, and their exit joins child
+            # processes, so an idle nested pool would hang it. Shut it down
+            # before multiprocessing closes the pool's queues (priority 10)
+            util.Finalize(None, shutdown_executor, exitpriority=100)
+    return _executor
+
+
+def shutdown_executor():
+    """Shut down the module-level process pool, if one is running."""
+    global _executor, _executor_workers
+
+    if _executor is not None:
+        # A pool inherited across fork belongs to the parent: its manager
+        # thread and worker pipes don't exist here, so just forget it
+        if _executor_pid == os.getpid():
+            _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+
+atexit.register(shutdown_executor)
+
+
+def map_frames(
+    func: Callable[..., np.ndarray],
+    frames: np.ndarray,
+    out_shape: tuple[int, ...],
+    out_dtype: np.dtype = np.uint8,
+    workers: int = 1,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Apply func to a frame stack in parallel, in contiguous frame ranges.
+
+    func must be a module-level function taking an (n, ...) block of frames
+    (plus kwargs) and returning the matching (n, ...) block of output.
+
+    Args:
+        func: Block function, e.g. palette.apply_palette
+        frames: Input stack shaped (N, ...)
+        out_shape: Shape of a single output frame
+        out_dtype: Output dtype
+        workers: Number of worker processes
+        **kwargs: Extra keyword arguments passed to func
+
+    Returns:
+        Output stack shaped (N, *out_shape)
+    """
+    frames = np.ascontiguousarray(frames)
+    count = len(frames)
+    full_out_shape = (count, *out_shape)
+
+    if workers <= 1 or count < 2:
+        out = np.empty(full_out_shape, dtype=out_dtype)
+        out[:] = func(frames, **kwargs)
+        return out
+
+    in_shm = shared_memory.SharedMemory(create=True, size=max(1, frames.nbytes))
+    out_shm = None
+    shared_in = shared_out = None
+    try:
+        out_size = int(np.prod(full_out_shape)) * np.dtype(out_dtype).itemsize
+        out_shm = shared_memory.SharedMemory(create=True, size=max(1, out_size))
+        shared_in = np.ndarray(frames.shape, dtype=frames.dtype, buffer=in_shm.buf)
+        shared_in[:] = frames
+
+        in_spec = (in_shm.name, frames.shape, frames.dtype.str)
+        out_spec = (out_shm.name, full_out_shape, np.dtype(out_dtype).str)
+        chunk = -(-count // workers)
+        futures = [
+            get_executor(workers).submit(
+                _run_block, func, in_spec, out_spec, start, start + chunk, kwargs
+            )
+            for start in range(0, count, chunk)
+        ]
+        for future in futures:
+            future.result()
+
+        shared_out = np.ndarray(full_out_shape, dtype=out_dtype, buffer=out_shm.buf)
+        return shared_out.copy()
+    finally:
+        # Views must be released before close(), also when a worker raised,
+        # or close() fails with BufferError and hides the worker's exception
+        shared_in = shared_out = None
+        for shm in (in_shm, out_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def _run_block(
+    func: Callable[..., np.ndarray],
+    in_spec: tuple,
+    out_spec: tuple,
+    start: int,
+    stop: int,
+    kwargs: dict,
+):
+    """Worker entry point: process frames[start:stop] in shared memory."""
+    in_name, in_shape, in_dtype = in_spec
+    out_name, out_shape, out_dtype = out_spec
+
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    frames = out = None
+    try:
+        frames = np.ndarray(in_shape, dtype=in_dtype, buffer=in_shm.buf)
+        out = np.ndarray(out_shape, dtype=out_dtype, buffer=out_shm.buf)
+        out[start:stop] = func(frames[start:stop], **kwargs)
+    finally:
+        frames = out = None
+        in_shm.close()
+        out_shm.close()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Scene - Retained-mode scene graph on top of frame_composer primitives.
+
+Shapes are added to a Scene once and then moved, scaled, rotated or faded
+between frames. Each node keeps its rasterized sprite and only redraws it when
+its geometry changes; nodes below the lowest changed node are kept in a cached
+static layer, so a frame costs work proportional to what actually changed.
+
+Example:
+    scene = Scene(128, 128, background=(255, 255, 255))
+    scene.add(Star(size=40, fill=(255, 215, 0)), x=64, y=64)
+    ball = scene.add(Circle(radius=10, fill=(255, 0, 0)), x=20, y=20, z=1)
+    for i in range(20):
+        ball.x = 20 + i * 4
+        builder.add_frame(scene.render())
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from core.frame_composer import downsample, draw_circle, draw_star, draw_text
+
+
+class Node:
+    """
+    Base scene node: position, transform, opacity and z-order.
+
+    Subclasses implement geometry_key() and rasterize(scale).
+    """
+
+    def __init__(
+        self,
+        x: float = 0,
+        y: float = 0,
+        scale: float = 1.0,
+        rotation: float = 0.0,
+        opacity: float = 1.0,
+        z: int = 0,
+        visible: bool = True,
+    ):
+        """
+        Args:
+            x: Horizontal position of the node's center
+            y: Vertical position of the node's center
+            scale: Uniform scale factor
+            rotation: Rotation in degrees (counter-clockwise)
+            opacity: 0.0 (invisible) to 1.0 (opaque)
+            z: Draw order; higher z is drawn on top
+            visible: If False the node is skipped
+        """
+        self.x = x
+        self.y = y
+        self.scale = scale
+        self.rotation = rotation
+        self.opacity = opacity
+        self.z = z
+        self.visible = visible
+
+        # (sprite key, sprite) and (opacity, faded sprite) from the last render
+        self._sprite: Optional[tuple[tuple, Image.Image]] = None
+        self._faded: Optional[tuple[float, Image.Image]] = None
+
+    def geometry_key(self) -> tuple:
+        """Hashable description of everything that affects the raster."""
+        raise NotImplementedError
+
+    def rasterize(self, scale: float) -> Image.Image:
+        """Draw the node as an RGBA sprite centered on the node's origin."""
+        raise NotImplementedError
+
+    def sprite(self, supersample: int = 1) -> Image.Image:
+        """Get the transformed, faded sprite, redrawing only if needed."""
+        scale = self.scale * supersample
+        key = (self.geometry_key(), scale, self.rotation)
+        if self._sprite is None or self._sprite[0] != key:
+            sprite = self.rasterize(scale)
+            if self.rotation % 360:
+                sprite = sprite.rotate(
+                    self.rotation, resample=Image.Resampling.BICUBIC, expand=True
+                )
+            self._sprite = (key, sprite)
+            self._faded = None
+
+        sprite = self._sprite[1]
+        if self.opacity >= 1.0:
+            return sprite
+        if self._faded is None or self._faded[0] != self.opacity:
+            faded = sprite.copy()
+            alpha = np.asarray(sprite.getchannel("A"), dtype=np.float32)
+            faded.putalpha(Image.fromarray((alpha * self.opacity).astype(np.uint8)))
+            self._faded = (self.opacity, faded)
+        return self._faded[1]
+
+    def state(self, supersample: int = 1) -> tuple:
+        """
+        Everything that affects how the node appears in a frame.
+
+        Args:
+            supersample: Canvas multiple the node is placed at (positions are
+                         rounded on that canvas, so sub-pixel moves count)
+        """
+        return (
+            self.geometry_key(),
+            self.scale,
+            self.rotation,
+            self.opacity,
+            round(self.x * supersample),
+            round(self.y * supersample),
+            self.z,
+            self.visible,
+        )
+
+
+class Circle(Node):
+    """Filled and/or outlined circle."""
+
+    def __init__(
+        self,
+        radius: float,
+        fill: Optional[tuple[int, int, int]] = None,
+        outline: Optional[tuple[int, int, int]] = None,
+        outline_width: int = 1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.radius = radius
+        self.fill = fill
+        self.outline = outline
+        self.outline_width = outline_width
+
+    def geometry_key(self) -> tuple:
+        return ("circle", self.radius, self.fill, self.outline, self.outline_width)
+
+    def rasterize(self, scale: float) -> Image.Image:
+        radius = max(1, round(self.radius * scale))
+        width = max(1, round(self.outline_width * scale))
+        half = radius + 1
+        sprite = Image.new("RGBA", (2 * half + 1, 2 * half + 1), (0, 0, 0, 0))
+        return draw_circle(sprite, (half, half), radius, self.fill, self.outline, width)
+
+
+class Star(Node):
+    """5-pointed star."""
+
+    def __init__(
+        self,
+        size: float,
+        fill: tuple[int, int, int],
+        outline: Optional[tuple[int, int, int]] = None,
+        outline_width: int = 1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.size = size
+        self.fill = fill
+        self.outline = outline
+        self.outline_width = outline_width
+
+    def geometry_key(self) -> tuple:
+        return ("star", self.size, self.fill, self.outline, self.outline_width)
+
+    def rasterize(self, scale: float) -> Image.Image:
+        size = max(1, round(self.size * scale))
+        width = max(1, round(self.outline_width * scale))
+        half = size + width + 1
+        sprite = Image.new("RGBA", (2 * half + 1, 2 * half + 1), (0, 0, 0, 0))
+        return draw_star(sprite, (half, half), size, self.fill, self.outline, width)
+
+
+class Polygon(Node):
+    """Polygon with points relative to the node's position."""
+
+    def __init__(
+        self,
+        points: Sequence[tuple[float, float]],
+        fill: Optional[tuple[int, int, int]] = None,
+        outline: Optional[tuple[int, int, int]] = None,
+        outline_width: int = 1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.points = [tuple(p) for p in points]
+        self.fill = fill
+        self.outline = outline
+        self.outline_width = outline_width
+
+    def geometry_key(self) -> tuple:
+        return (
+            "polygon",
+            tuple(self.points),
+            self.fill,
+            self.outline,
+            self.outline_width,
+        )
+
+    def rasterize(self, scale: float) -> Image.Image:
+        extent = max(max(abs(px), abs(py)) for px, py in self.points) * scale
+        width = max(1, round(self.outline_width * scale))
+        half = int(np.ceil(extent)) + width
+        sprite = Image.new("RGBA", (2 * half + 1, 2 * half + 1), (0, 0, 0, 0))
+        points = [(half + px * scale, half + py * scale) for px, py in self.points]
+        ImageDraw.Draw(sprite).polygon(
+            points, fill=self.fill, outline=self.outline, width=width
+        )
+        return sprite
+
+
+class Text(Node):
+    """Text label centered on the node's position, in Pillow's default font."""
+
+    def __init__(self, text: str, color: tuple[int, int, int] = (0, 0, 0), **kwargs):
+        super().__init__(**kwargs)
+        self.text = text
+        self.color = color
+
+    def geometry_key(self) -> tuple:
+        return ("text", self.text, self.color)
+
+    def rasterize(self, scale: float) -> Image.Image:
+        left, top, right, bottom = ImageFont.load_default().getbbox(self.text)
+        width, height = right - left, bottom - top
+        sprite = Image.new("RGBA", (width + 2, height + 2), (0, 0, 0, 0))
+        draw_text(sprite, self.text, (1 - left, 1 - top), self.color)
+        if scale != 1.0:
+            size = (
+                max(1, round(sprite.width * scale)),
+                max(1, round(sprite.height * scale)),
+            )
+            sprite = sprite.resize(size, Image.Resampling.LANCZOS)
+        return sprite
+
+
+class ImageNode(Node):
+    """Existing image (e.g. an uploaded emoji) centered on the node's position."""
+
+    def __init__(self, image: Image.Image, **kwargs):
+        super().__init__(**kwargs)
+        self.image = image.convert("RGBA")
+
+    def geometry_key(self) -> tuple:
+        return ("image", id(self.image))
+
+    def rasterize(self, scale: float) -> Image.Image:
+        if scale == 1.0:
+            return self.image
+        size = (
+            max(1, round(self.image.width * scale)),
+            max(1, round(self.image.height * scale)),
+        )
+        return self.image.resize(size, Image.Resampling.LANCZOS)
+
+
+class Scene:
+    """
+    Retained-mode collection of nodes that renders frames incrementally.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        background: tuple[int, int, int] | Image.Image = (255, 255, 255),
+        supersample: int = 1,
+    ):
+        """
+        Args:
+            width: Frame width
+            height: Frame height
+            background: RGB color or an image (e.g. create_gradient_background)
+            supersample: Render at this multiple of the size and box-filter
+                         down, for anti-aliased edges (node coordinates stay
+                         in output pixels)
+        """
+        self.width = width
+        self.height = height
+        self.supersample = supersample
+        canvas = (width * supersample, height * supersample)
+        if isinstance(background, Image.Image):
+            self.background = background.convert("RGBA").resize(canvas)
+        else:
+            self.background = Image.new("RGBA", canvas, (*background, 255))
+
+        self.nodes: list[Node] = []
+
+        # Composite of the bottom-most unchanged nodes, their states, and the
+        # states of every node in the previous frame
+        self._static_layer = self.background.copy()
+        self._static_states: list[tuple] = []
+        self._previous_states: list[tuple] = []
+
+        # Counters for the last render()
+        self.rasterized = 0
+        self.composited = 0
+
+    def add(self, node: Node, **properties) -> Node:
+        """
+        Add a node to the scene.
+
+        Args:
+            node: Node to add
+            **properties: Node attributes to set (x, y, z, opacity, ...)
+
+        Returns:
+            The node, for later updates
+        """
+        for name, value in properties.items():
+            setattr(node, name, value)
+        self.nodes.append(node)
+        return node
+
+    def remove(self, node: Node):
+        """Remove a node from the scene."""
+        self.nodes.remove(node)
+
+    def render(self) -> Image.Image:
+        """
+        Render the current state of the scene.
+
+        Returns:
+            RGB frame
+        """
+        order = sorted(
+            (node for node in self.nodes if node.visible), key=lambda node: node.z
+        )
+        states = [node.state(self.supersample) for node in order]
+
+        # Bottom run of nodes that did not change since the previous frame
+        stable = 0
+        for old, new in zip(self._previous_states, states):
+            if old != new:
+                break
+            stable += 1
+
+        self.rasterized = 0
+        self.composited = 0
+
+        cached = len(self._static_states)
+        if stable < cached:
+            # A node inside the static layer changed: rebuild it from the
+            # nodes below that one
+            self._static_layer = self.background.copy()
+            cached = 0
+        for node in order[cached:stable]:
+            self._composite(self._static_layer, node)
+        self._static_states = states[:stable]
+
+        frame = self._static_layer.copy()
+        for node in order[stable:]:
+            self._composite(frame, node)
+
+        self._previous_states = states
+        if self.supersample > 1:
+            return Image.fromarray(downsample(frame.convert("RGB"), self.supersample))
+        return frame.convert("RGB")
+
+    def _composite(self, layer: Image.Image, node: Node):
+        """Blend a node's sprite onto the layer, clipped to the frame."""
+        cached = node._sprite
+        sprite = node.sprite(self.supersample)
+        if node._sprite is not cached:
+            self.rasterized += 1
+
+        left = round(node.x * self.supersample) - sprite.width // 2
+        top = round(node.y * self.supersample) - sprite.height // 2
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + sprite.width, self.background.width)
+        y1 = min(top + sprite.height, self.background.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        layer.alpha_composite(
+            sprite, dest=(x0, y0), source=(x0 - left, y0 - top, x1 - left, y1 - top)
+        )
+        self.composited += 1
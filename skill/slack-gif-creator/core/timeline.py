@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Timeline - Keyframe animation compiled into per-frame property arrays.
+
+Properties (position, scale, rotation, color, opacity, ...) get keyframes
+with easing names. compile() evaluates every track once, a whole segment at a
+time, into contiguous NumPy arrays indexed by frame, so the render loop only
+reads values.
+
+Example:
+    timeline = Timeline(fps=15)
+    timeline.keyframe("ball", "position", 0, (20, 100))
+    timeline.keyframe("ball", "position", 20, (108, 100), easing="bounce_out")
+    timeline.keyframe("ball", "opacity", 0, 0.0)
+    timeline.keyframe("ball", "opacity", 5, 1.0)
+
+    compiled = timeline.compile()
+    for i in range(compiled.frame_count):
+        compiled.apply(i, {"ball": ball_node})
+        builder.add_frame(scene.render())
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from core.easing import get_easing_array
+
+# Properties applied as integer RGB tuples (scene node colors), plus "*_color"
+COLOR_PROPERTIES = {"color", "fill", "outline"}
+
+
+class Timeline:
+    """Keyframes per (target, property) track."""
+
+    def __init__(self, frame_count: Optional[int] = None, fps: int = 15):
+        """
+        Args:
+            frame_count: Total frames (default: last keyframe + 1)
+            fps: Frames per second (stored for reference and serialization)
+        """
+        self.frame_count = frame_count
+        self.fps = fps
+        # (target, property) -> {frame: (value, easing, arc)}
+        self.tracks: dict[tuple[str, str], dict[int, tuple]] = {}
+
+    def keyframe(
+        self,
+        target: str,
+        prop: str,
+        frame: int,
+        value: float | Sequence[float],
+        easing: str = "linear",
+        arc: float = 0.0,
+    ) -> "Timeline":
+        """
+        Set a property's value at a frame.
+
+        Args:
+            target: Name of the animated object (e.g. "ball")
+            prop: Property name (e.g. "position", "scale", "color")
+            frame: Frame index
+            value: Number or tuple of numbers (all keyframes of a track must
+                   have the same length)
+            easing: Easing for the segment that ends at this keyframe
+            arc: For (x, y) values, height of a parabolic arc on the segment
+                 ending here (positive = upward, as in calculate_arc_motion)
+
+        Returns:
+            The timeline, for chaining
+        """
+        if frame < 0:
+            raise ValueError(f"Keyframe frame must be >= 0, got {frame}")
+        value = tuple(float(v) for v in np.atleast_1d(value))
+        track = self.tracks.setdefault((target, prop), {})
+        if track:
+            width = len(next(iter(track.values()))[0])
+            if len(value) != width:
+                raise ValueError(
+                    f"{target}.{prop} has {width}-value keyframes, got {len(value)}"
+                )
+        if arc and len(value) != 2:
+            raise ValueError("arc only applies to (x, y) values")
+        track[frame] = (value, easing, arc)
+        return self
+
+    def compile(self) -> "CompiledTimeline":
+        """
+        Evaluate every track for every frame.
+
+        Values hold before the first and after the last keyframe.
+
+        Returns:
+            CompiledTimeline with one (frames, values) array per track
+        """
+        if not self.tracks:
+            raise ValueError("Timeline has no keyframes")
+
+        last = max(max(track) for track in self.tracks.values())
+        frame_count = self.frame_count if self.frame_count is not None else last + 1
+
+        arrays = {}
+        for (target, prop), track in self.tracks.items():
+            frames = sorted(track)
+            values = np.empty((frame_count, len(track[frames[0]][0])))
+
+            first_value = track[frames[0]][0]
+            values[: min(frames[0], frame_count)] = first_value
+            for start, end in zip(frames, frames[1:]):
+                if start >= frame_count:
+                    break
+                a = np.array(track[start][0])
+                b, easing, arc = track[end]
+                b = np.array(b)
+
+                stop = min(end, frame_count - 1)
+                t = (np.arange(start, stop + 1) - start) / (end - start)
+                eased = get_easing_array(easing)(t)[:, None]
+                segment = a + (b - a) * eased
+                if arc:
+                    segment[:, 1] -= 4 * arc * t * (1 - t)
+                values[start : stop + 1] = segment
+            if frames[-1] < frame_count:
+                values[frames[-1] :] = track[frames[-1]][0]
+
+            arrays[f"{target}.{prop}"] = values
+
+        return CompiledTimeline(arrays, frame_count, self.fps)
+
+    def to_dict(self) -> dict:
+        """Serializable form of the keyframes."""
+        return {
+            "frame_count": self.frame_count,
+            "fps": self.fps,
+            "keyframes": [
+                {
+                    "target": target,
+                    "prop": prop,
+                    "frame": frame,
+                    "value": list(value),
+                    "easing": easing,
+                    "arc": arc,
+                }
+                for (target, prop), track in self.tracks.items()
+                for frame, (value, easing, arc) in sorted(track.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Timeline":
+        """Rebuild a timeline from to_dict() output."""
+        timeline = cls(frame_count=data.get("frame_count"), fps=data.get("fps", 15))
+        for key in data["keyframes"]:
+            timeline.keyframe(
+                key["target"],
+                key["prop"],
+                key["frame"],
+                key["value"],
+                key.get("easing", "linear"),
+                key.get("arc", 0.0),
+            )
+        return timeline
+
+    def save(self, path: str | Path):
+        """Save the keyframes as JSON."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Timeline":
+        """Load keyframes saved with save()."""
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+class CompiledTimeline:
+    """Per-frame property values, one contiguous array per track."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], frame_count: int, fps: int):
+        """
+        Args:
+            arrays: "target.prop" -> (frame_count, values) array
+            frame_count: Number of frames
+            fps: Frames per second
+        """
+        self.arrays = {
+            name: np.ascontiguousarray(values) for name, values in arrays.items()
+        }
+        self.frame_count = frame_count
+        self.fps = fps
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Values of a track; single-value tracks are returned as 1-D arrays."""
+        values = self.arrays[name]
+        return values[:, 0] if values.shape[1] == 1 else values
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def frame(self, index: int) -> dict[str, dict[str, Any]]:
+        """
+        All property values at a frame.
+
+        Returns:
+            {target: {prop: value}}, with values as floats or tuples
+        """
+        values: dict[str, dict[str, Any]] = {}
+        for name, array in self.arrays.items():
+            target, prop = name.split(".", 1)
+            row = array[index]
+            values.setdefault(target, {})[prop] = (
+                float(row[0]) if len(row) == 1 else tuple(row.tolist())
+            )
+        return values
+
+    def apply(self, index: int, objects: dict[str, Any]):
+        """
+        Set a frame's values as attributes on objects (e.g. scene nodes).
+
+        "position" sets x and y; color properties (COLOR_PROPERTIES or
+        "*_color") are set as integer RGB tuples, other multi-value properties
+        as float tuples, and single values as floats.
+
+        Args:
+            index: Frame index
+            objects: Target name -> object to update
+        """
+        for name, array in self.arrays.items():
+            target, prop = name.split(".", 1)
+            obj = objects.get(target)
+            if obj is None:
+                continue
+            row = array[index]
+            if prop == "position":
+                obj.x, obj.y = float(row[0]), float(row[1])
+            elif prop in COLOR_PROPERTIES or prop.endswith("_color"):
+                setattr(obj, prop, tuple(int(round(v)) for v in row))
+            elif len(row) == 1:
+                setattr(obj, prop, float(row[0]))
+            else:
+                setattr(obj, prop, tuple(row.tolist()))
+
+    def save(self, path: str | Path):
+        """Save the compiled arrays as .npz for reuse without recompiling."""
+        np.savez(
+            path,
+            __frame_count__=self.frame_count,
+            __fps__=self.fps,
+            **self.arrays,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompiledTimeline":
+        """Load arrays saved with save()."""
+        with np.load(path) as data:
+            arrays = {
+                name: data[name] for name in data.files if not name.startswith("__")
+            }
+            return cls(arrays, int(data["__frame_count__"]), int(data["__fps__"]))
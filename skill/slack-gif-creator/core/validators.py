@@ -5,7 +5,27 @@ Validators - Check if GIFs meet Slack's requirements.
 These validators help ensure your GIFs meet Slack's size and dimension constraints.
 """
 
+import argparse
+import glob
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import as_completed
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterable, Optional, TextIO
+
+from core.gif_reader import scan_gif
+from core.parallel import get_executor, resolve_workers
+
+# Files validated per worker task in validate_many()
+VALIDATE_CHUNK_SIZE = 64
+
+# Bumped whenever validate_gif() results change shape or meaning, so cached
+# results from older versions are recomputed
+VALIDATION_CACHE_VERSION = 2
 
 
 def validate_gif(
@@ -22,8 +42,6 @@ def validate_gif(
     Returns:
         Tuple of (passes: bool, results: dict with all details)
     """
-    from PIL import Image
-
     gif_path = Path(gif_path)
 
     if not gif_path.exists():
@@ -34,32 +52,19 @@ def validate_gif(
     size_kb = size_bytes / 1024
     size_mb = size_kb / 1024
 
-    # Get dimensions and frame info
+    # Get dimensions and frame info from the block structure (no decoding)
     try:
-        with Image.open(gif_path) as img:
-            width, height = img.size
-
-            # Count frames
-            frame_count = 0
-            try:
-                while True:
-                    img.seek(frame_count)
-                    frame_count += 1
-            except EOFError:
-                pass
-
-            # Get duration
-            try:
-                duration_ms = img.info.get("duration", 100)
-                total_duration = (duration_ms * frame_count) / 1000
-                fps = frame_count / total_duration if total_duration > 0 else 0
-            except:
-                total_duration = None
-                fps = None
-
-    except Exception as e:
+        info = scan_gif(gif_path)
+    except (OSError, ValueError, struct.error) as e:
         return False, {"error": f"Failed to read GIF: {e}"}
 
+    width, height = info.width, info.height
+    frame_count = info.frame_count
+    frame_delays = info.durations
+    # Timing as played: browsers show delays under 20 ms as 100 ms
+    total_duration = info.playback_duration_ms / 1000
+    fps = frame_count / total_duration if total_duration > 0 else 0
+
     # Validate dimensions
     if is_emoji:
         optimal = width == height == 128
@@ -83,6 +88,11 @@ def validate_gif(
         "frame_count": frame_count,
         "duration_seconds": total_duration,
         "fps": fps,
+        "frame_delays_ms": frame_delays,
+        "playback_delays_ms": info.playback_durations,
+        "palette_sizes": [frame.palette_size for frame in info.frames],
+        # Lists rather than tuples, so results match those read back from a cache
+        "frame_rects": [list(frame.rect) for frame in info.frames],
         "is_emoji": is_emoji,
         "optimal": optimal if is_emoji else None,
     }
@@ -113,7 +123,7 @@ def validate_gif(
             )
 
         if size_mb > 5.0:
-            print(f"  Note: Large file size - consider fewer frames/colors")
+            print("  Note: Large file size - consider fewer frames/colors")
 
     return dim_pass, results
 
@@ -134,3 +144,232 @@ def is_slack_ready(
     """
     passes, _ = validate_gif(gif_path, is_emoji, verbose)
     return passes
+
+
+def validate_many(
+    paths: str | Path | Iterable[str | Path],
+    is_emoji: bool = True,
+    workers: Optional[int] = None,
+    output: Optional[str | Path | TextIO] = None,
+    cache_path: Optional[str | Path] = None,
+    verbose: bool = True,
+) -> dict:
+    """
+    Validate many GIFs concurrently on a process pool.
+
+    Results are written as JSON Lines as soon as each chunk of files is done.
+    With a cache file, files whose (path, mtime, size) are unchanged since the
+    last run are not read again.
+
+    Args:
+        paths: GIF path, directory (searched recursively), glob pattern such as
+               "emoji/**/*.gif", or a list of any of these
+        is_emoji: True for emoji GIFs, False for message GIFs
+        workers: Worker processes (None = one per CPU, 1 = in this process)
+        output: JSON Lines destination (path, open file, or "-" for stdout)
+        cache_path: JSON file of results from earlier runs, updated in place
+        verbose: Print failures and a summary
+
+    Returns:
+        Dictionary with "files" (per-file results, input order) and "summary"
+    """
+    files = expand_gif_paths(paths)
+    workers = resolve_workers(workers)
+    cache = _load_validation_cache(cache_path) if cache_path else {}
+
+    start = time.perf_counter()
+    results: list[Optional[dict]] = [None] * len(files)
+    stamps = [_file_stamp(path, is_emoji) for path in files]
+    pending = []
+    for i, (path, stamp) in enumerate(zip(files, stamps)):
+        entry = cache.get(str(path))
+        if stamp is not None and entry is not None and entry["stamp"] == stamp:
+            results[i] = entry["result"]
+        else:
+            pending.append(i)
+    cached = len(files) - len(pending)
+
+    with ExitStack() as stack:
+        if output == "-":
+            output = sys.stdout
+        elif output is not None and not hasattr(output, "write"):
+            output = stack.enter_context(open(output, "w"))
+
+        def finish(indices: list[int], chunk_results: list[dict]):
+            for i, result in zip(indices, chunk_results):
+                results[i] = result
+                if stamps[i] is not None:
+                    cache[str(files[i])] = {"stamp": stamps[i], "result": result}
+                if verbose and not result["passes"]:
+                    reason = result.get("error") or "dimensions"
+                    print(f"  ✗ {files[i]}: {reason}")
+            if output is not None:
+                for i in indices:
+                    output.write(json.dumps(results[i]) + "\n")
+
+        if output is not None:
+            for i in range(len(files)):
+                if results[i] is not None:
+                    output.write(json.dumps(results[i]) + "\n")
+
+        chunks = [
+            pending[i : i + VALIDATE_CHUNK_SIZE]
+            for i in range(0, len(pending), VALIDATE_CHUNK_SIZE)
+        ]
+        if workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                finish(chunk, _validate_chunk([files[i] for i in chunk], is_emoji))
+        else:
+            executor = get_executor(workers)
+            futures = {
+                executor.submit(
+                    _validate_chunk, [files[i] for i in chunk], is_emoji
+                ): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+
+    elapsed = time.perf_counter() - start
+    if cache_path:
+        _save_validation_cache(cache_path, cache)
+
+    passed = [r for r in results if r["passes"]]
+    errors = [r for r in results if "error" in r]
+    summary = {
+        "files": len(results),
+        "passed": len(passed),
+        "failed": len(results) - len(passed),
+        "errors": len(errors),
+        "cached": cached,
+        "workers": workers,
+        "wall_seconds": elapsed,
+        "files_per_second": len(pending) / elapsed if elapsed > 0 else 0.0,
+        "total_size_kb": sum(r.get("size_kb", 0) for r in results),
+    }
+
+    if verbose:
+        print(f"\n✓ Validated {summary['files']} GIFs ({cached} unchanged, cached)")
+        print(f"  Passed: {summary['passed']}, failed: {summary['failed']}")
+        print(f"  Unreadable: {summary['errors']}")
+        print(f"  Time: {elapsed:.1f}s ({summary['files_per_second']:.0f} files/s)")
+
+    return {"files": results, "summary": summary}
+
+
+def expand_gif_paths(paths: str | Path | Iterable[str | Path]) -> list[Path]:
+    """
+    Expand paths, directories and glob patterns into a list of GIF files.
+
+    Args:
+        paths: Path, directory, glob pattern, or a list of these
+
+    Returns:
+        Unique paths in the order given (sorted within directories and globs)
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    files: dict[Path, None] = {}
+    for item in paths:
+        item = str(item)
+        if glob.has_magic(item):
+            matches = sorted(glob.glob(item, recursive=True))
+        elif os.path.isdir(item):
+            matches = sorted(
+                str(p) for p in Path(item).rglob("*") if p.suffix.lower() == ".gif"
+            )
+        else:
+            matches = [item]
+        for match in matches:
+            files.setdefault(Path(match), None)
+    return list(files)
+
+
+def _validate_chunk(paths: list[Path], is_emoji: bool) -> list[dict]:
+    """Worker task: validate a chunk of files quietly."""
+    results = []
+    for path in paths:
+        _, result = validate_gif(path, is_emoji=is_emoji, verbose=False)
+        if "error" in result:
+            result = {"file": str(path), "passes": False, **result}
+        results.append(result)
+    return results
+
+
+def _file_stamp(path: Path, is_emoji: bool) -> Optional[list]:
+    """Cache key parts that change whenever a file's result could change."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size, is_emoji, VALIDATION_CACHE_VERSION]
+
+
+def _load_validation_cache(cache_path: str | Path) -> dict:
+    try:
+        return json.loads(Path(cache_path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_validation_cache(cache_path: str | Path, cache: dict):
+    # Written beside the target and renamed, so an interrupted run never
+    # leaves a half-written cache
+    cache_path = Path(cache_path)
+    temp = cache_path.with_name(cache_path.name + ".tmp")
+    temp.write_text(json.dumps(cache))
+    os.replace(temp, cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate many GIFs for Slack in parallel",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m core.validators emoji/
+  python -m core.validators "mirror/**/*.gif" --workers 32 --output report.jsonl --cache .gif-cache.json
+        """,
+    )
+
+    parser.add_argument(
+        "paths", nargs="+", help="GIF files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "--message",
+        action="store_true",
+        help="Validate as message GIFs instead of emoji",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--output", help="Write per-file results as JSON Lines ('-' for stdout)"
+    )
+    parser.add_argument("--cache", help="Result cache file reused across runs")
+    parser.add_argument("--summary", help="Write the aggregate summary as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        report = validate_many(
+            args.paths,
+            is_emoji=not args.message,
+            workers=args.workers,
+            output=args.output,
+            cache_path=args.cache,
+            verbose=args.output != "-",
+        )
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(report["summary"], indent=2))
+
+    return 0 if report["summary"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark easing lookup tables against the direct easing implementations.
+
+Usage:
+    python scripts/benchmark_easing.py [--samples N] [--resolution R]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.easing import (
+    EASING_FUNCTIONS,
+    get_easing_array,
+    get_easing_lut,
+)
+
+CURVES = ("elastic_out", "elastic", "bounce_out", "bounce", "back_in_out")
+
+
+def best_of(func, repeats: int = 5) -> float:
+    """Fastest of several timed runs, in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark easing lookup tables")
+    parser.add_argument("--samples", type=int, default=100_000, help="t values per run")
+    parser.add_argument("--resolution", type=int, default=1024, help="LUT intervals")
+    args = parser.parse_args()
+
+    ts = np.random.default_rng(0).random(args.samples)
+    ts_list = ts.tolist()
+
+    print(f"{args.samples} samples, LUT resolution {args.resolution}\n")
+    print(
+        f"{'curve':<12} {'scalar':>9} {'lut':>9} {'speedup':>8}"
+        f" {'array':>9} {'lut.many':>9} {'speedup':>8} {'max err':>9}"
+    )
+
+    for name in CURVES:
+        direct = EASING_FUNCTIONS[name]
+        direct_array = get_easing_array(name)
+        lut = get_easing_lut(name, args.resolution)
+
+        scalar = best_of(lambda direct=direct: [direct(t) for t in ts_list])
+        scalar_lut = best_of(lambda lut=lut: [lut.scalar(t) for t in ts_list])
+        array = best_of(lambda direct_array=direct_array: direct_array(ts))
+        array_lut = best_of(lambda lut=lut: lut.many(ts))
+        error = float(np.max(np.abs(lut.many(ts) - direct_array(ts))))
+
+        print(
+            f"{name:<12} {scalar * 1e3:>7.1f}ms {scalar_lut * 1e3:>7.1f}ms"
+            f" {scalar / scalar_lut:>7.1f}x {array * 1e3:>7.2f}ms"
+            f" {array_lut * 1e3:>7.2f}ms {array / array_lut:>7.1f}x {error:>9.1e}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark the core.gif_encoder LZW encoder against Pillow and imageio.
+
+Pillow and the LZW encoder write exactly the frames GIFBuilder.save() produces
+(one global palette, changed regions only), so their sizes compare like for
+like. Lossy rows go through GIFStream, so they include its lossy delta
+frames. imageio, when installed, is given the RGB frames and does its own
+quantization, so its size is only indicative.
+
+Usage:
+    python scripts/benchmark_gif_encoder.py [--frames N] [--colors C] [--lossy L ...]
+                                            [--noise SIGMA]
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.gif_builder import GIFBuilder, GIFStream, _delta_region
+from core.gif_encoder import GIFEncoder
+
+try:
+    import imageio.v3 as iio
+except ImportError:
+    iio = None
+
+
+def render_frames(size: int, count: int, noise: float = 0) -> list[Image.Image]:
+    """
+    Bouncing, color-shifting circles on a gradient: typical Slack content.
+
+    noise adds Gaussian grain of that standard deviation and a slight
+    brightness flicker, like frames cut from a video.
+    """
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        t = i / count
+        frame = Image.new("RGB", (size, size))
+        ramp = np.linspace(0, 1, size)[:, None, None]
+        top, bottom = np.array([255, 240, 200]), np.array([120, 180, 255])
+        frame.paste(
+            Image.fromarray(
+                np.broadcast_to(top + (bottom - top) * ramp, (size, size, 3)).astype(
+                    np.uint8
+                )
+            )
+        )
+        draw = ImageDraw.Draw(frame)
+        for k in range(6):
+            x = size * (0.15 + 0.7 * ((t + k / 6) % 1))
+            y = size * (0.5 + 0.3 * np.sin(2 * np.pi * (t + k / 6)))
+            r = size * 0.08
+            draw.ellipse(
+                [x - r, y - r, x + r, y + r],
+                fill=(40 * k, 255 - 30 * k, 120),
+                outline=(0, 0, 0),
+                width=max(2, size // 64),
+            )
+        if noise:
+            pixels = np.asarray(frame, dtype=np.float64)
+            pixels = pixels + rng.normal(0, noise, pixels.shape) + noise * np.sin(i)
+            frame = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+        frames.append(frame)
+    return frames
+
+
+def delta_frames(indices: np.ndarray, palette: np.ndarray) -> list[tuple]:
+    """The (region, offset, transparency) frames GIFBuilder.save() writes."""
+    frames = [(indices[0], (0, 0), None)]
+    for previous, current in zip(indices, indices[1:]):
+        frames.append(_delta_region(previous, current, len(palette)))
+    return frames
+
+
+def encode_lzw(
+    frames: list[tuple], palette: np.ndarray, strategy: str, lossy: float = 0
+) -> bytes:
+    height, width = frames[0][0].shape
+    buffer = io.BytesIO()
+    encoder = GIFEncoder(
+        buffer, width, height, palette, clear_strategy=strategy, lossy=lossy
+    )
+    for region, offset, transparency in frames:
+        encoder.add_frame(
+            region, offset, delay_cs=10, disposal=1, transparency=transparency
+        )
+    encoder.finish()
+    return buffer.getvalue()
+
+
+def encode_lossy(indices: np.ndarray, palette: np.ndarray, lossy: float) -> bytes:
+    """GIFStream with lossy on, as save(lossy=...) writes it."""
+    height, width = indices.shape[1:]
+    buffer = io.BytesIO()
+    stream = GIFStream(
+        buffer, width, height, 10, palette=palette, lossy=lossy, verbose=False
+    )
+    for frame in indices:
+        stream.add_indices(frame)
+    stream.finish()
+    return buffer.getvalue()
+
+
+def encode_pillow(frames: list[tuple], palette: np.ndarray) -> bytes:
+    """Pillow's GIF plugin on the same frames (save()'s default path)."""
+    canvas = Image.fromarray(frames[0][0])
+    canvas.putpalette(palette.tobytes())
+    header, _ = GifImagePlugin.getheader(canvas, info={"loop": 0})
+    chunks = [b"".join(header)]
+    for region, offset, transparency in frames:
+        image = Image.fromarray(region)
+        image.putpalette(palette.tobytes())
+        params = {"duration": 100, "disposal": 1}
+        if transparency is not None:
+            params["transparency"] = transparency
+        chunks.extend(GifImagePlugin.getdata(image, offset, **params))
+    chunks.append(b";")
+    return b"".join(chunks)
+
+
+def encode_imageio(rgb_frames: np.ndarray) -> bytes:
+    """imageio on the RGB frames (it quantizes and crops frames itself)."""
+    return iio.imwrite("<bytes>", rgb_frames, extension=".gif", duration=100, loop=0)
+
+
+def best_of(func, repeats: int = 3) -> tuple[float, bytes]:
+    """Fastest of several timed runs, in seconds, and the last output."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        data = func()
+        times.append(time.perf_counter() - start)
+    return min(times), data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GIF encoders")
+    parser.add_argument("--frames", type=int, default=12, help="Frames per GIF")
+    parser.add_argument("--colors", type=int, default=48, help="Palette size")
+    parser.add_argument(
+        "--lossy",
+        type=float,
+        nargs="*",
+        default=[10, 20, 40],
+        help="Lossy error budgets to include",
+    )
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=0,
+        help="Grain added to the frames (e.g. 4 for video-like frames)",
+    )
+    args = parser.parse_args()
+
+    strategies = ("reset", "deferred", "adaptive")
+    if iio is None:
+        print("(imageio not installed; skipping it)")
+
+    for size in (128, 480):
+        builder = GIFBuilder(size, size)
+        builder.add_frames(render_frames(size, args.frames, args.noise))
+        indices, palette = builder.quantize_frames(args.colors)
+        frames = delta_frames(indices, palette)
+
+        # Loop values are bound as defaults rather than closed over
+        encoders = {
+            "pillow": lambda frames=frames, palette=palette: encode_pillow(
+                frames, palette
+            )
+        }
+        for strategy in strategies:
+            encoders[f"lzw {strategy}"] = (
+                lambda frames=frames, palette=palette, strategy=strategy: encode_lzw(
+                    frames, palette, strategy
+                )
+            )
+        for lossy in args.lossy:
+            encoders[f"lzw lossy={lossy:g}"] = (
+                lambda indices=indices, palette=palette, lossy=lossy: encode_lossy(
+                    indices, palette, lossy
+                )
+            )
+        if iio is not None:
+            rgb_frames = np.stack(builder.frames)
+            encoders["imageio"] = lambda rgb_frames=rgb_frames: encode_imageio(
+                rgb_frames
+            )
+
+        print(f"\n{size}x{size}, {args.frames} frames, {len(palette)} colors")
+        print(
+            f"{'encoder':<14} {'time':>10} {'bytes':>10}"
+            f" {'vs pillow':>10} {'vs lzw':>8}"
+        )
+        sizes = {}
+        for name, encode in encoders.items():
+            seconds, data = best_of(encode)
+            sizes[name] = len(data)
+            print(
+                f"{name:<14} {seconds * 1e3:>8.1f}ms {len(data):>10}"
+                f" {len(data) / sizes['pillow']:>9.1%}"
+                f" {len(data) / sizes.get('lzw reset', len(data)):>7.1%}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())